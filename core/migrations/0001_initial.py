@@ -0,0 +1,50 @@
+# Generated by Django 5.2.17 on 2026-08-27 23:18
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(help_text="Label app.Model de l'objet supprimé", max_length=100, verbose_name='Modèle')),
+                ('object_pk', models.CharField(max_length=64, verbose_name='Clé primaire')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name="Données de l'objet")),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de suppression')),
+            ],
+            options={
+                'verbose_name': 'Journal de suppression',
+                'verbose_name_plural': 'Journaux de suppression',
+                'ordering': ['-deleted_at'],
+                'indexes': [models.Index(fields=['model_label', 'object_pk'], name='core_deleti_model_l_82da44_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Item',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Nom descriptif de l'objet de collection", max_length=200, verbose_name="Nom de l'objet")),
+                ('category', models.CharField(choices=[('cards', 'Cartes à collectionner'), ('figurines', 'Figurines'), ('comics', 'Bandes dessinées'), ('toys', 'Jouets vintage'), ('art', 'Art et illustrations'), ('other', 'Autres')], default='other', max_length=20, verbose_name='Catégorie')),
+                ('edition', models.CharField(blank=True, help_text="Édition ou série de l'objet", max_length=100, verbose_name='Édition')),
+                ('total_supply', models.PositiveIntegerField(help_text="Quantité totale d'objets en circulation", validators=[django.core.validators.MinValueValidator(1)], verbose_name='Offre totale')),
+                ('description', models.TextField(blank=True, help_text="Description détaillée de l'objet", verbose_name='Description')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Objet de collection',
+                'verbose_name_plural': 'Objets de collection',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['category', '-created_at'], name='core_item_categor_7c92e2_idx'), models.Index(fields=['created_at'], name='core_item_created_b1817e_idx')],
+            },
+        ),
+    ]
@@ -42,26 +42,60 @@ class UUIDMixin(models.Model):
 class SoftDeleteMixin(models.Model):
     """
     Mixin pour la suppression logique (soft delete).
+
+    L'état supprimé est porté uniquement par `deleted_at` (NULL = actif),
+    avec un index partiel sur les lignes actives pour que les requêtes
+    du manager restent des parcours d'index denses.
     """
-    is_deleted = models.BooleanField(default=False, verbose_name="Supprimé")
     deleted_at = models.DateTimeField(null=True, blank=True, verbose_name="Date de suppression")
-    
+
     class Meta:
         abstract = True
-    
+        indexes = [
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=True),
+                name='%(class)s_active_idx'
+            ),
+        ]
+
+    @property
+    def is_deleted(self) -> bool:
+        """Vérifie si l'objet est supprimé logiquement."""
+        return self.deleted_at is not None
+
     def delete(self, using=None, keep_parents=False):
         """Suppression logique au lieu de suppression physique."""
-        self.is_deleted = True
         self.deleted_at = timezone.now()
         self.save(using=using)
-    
+
     def hard_delete(self, using=None, keep_parents=False):
         """Suppression physique réelle."""
         super().delete(using=using, keep_parents=keep_parents)
-    
+
+    def purge(self, using=None, keep_parents=False):
+        """
+        Suppression physique avec pierre tombale dans DeletionLog.
+
+        Contrairement à delete(), la ligne quitte réellement la table
+        principale (et ses index) ; une copie sérialisée est conservée
+        dans le journal pour restauration manuelle.
+        """
+        from django.db import transaction
+        from .models import DeletionLog
+
+        payload = self.to_dict() if hasattr(self, 'to_dict') else {}
+
+        with transaction.atomic(using=using):
+            DeletionLog.objects.create(
+                model_label=self._meta.label,
+                object_pk=str(self.pk),
+                payload=payload
+            )
+            super().delete(using=using, keep_parents=keep_parents)
+
     def restore(self):
         """Restaure un objet supprimé logiquement."""
-        self.is_deleted = False
         self.deleted_at = None
         self.save()
 
@@ -70,46 +104,87 @@ class SerializableMixin:
     """
     Mixin ajoutant des méthodes de sérialisation.
     """
-    
+
+    @classmethod
+    def _serializable_field_names(cls) -> tuple:
+        """Noms de champs sérialisables, calculés une fois par classe."""
+        names = cls.__dict__.get('_serializable_names_cache')
+        if names is None:
+            names = tuple(field.name for field in cls._meta.fields)
+            cls._serializable_names_cache = names
+        return names
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convertit l'instance en dictionnaire.
-        
+
         Returns:
             Dict représentant l'objet
         """
         data = {}
-        
-        for field in self._meta.fields:
-            value = getattr(self, field.name)
-            
+
+        for name in type(self)._serializable_field_names():
+            value = getattr(self, name)
+
             # Gestion des types spéciaux
             if hasattr(value, 'isoformat'):  # datetime
-                data[field.name] = value.isoformat()
-            elif hasattr(value, '__str__') and not isinstance(value, str):
-                data[field.name] = str(value)
+                data[name] = value.isoformat()
+            elif isinstance(value, str):
+                data[name] = value
             else:
-                data[field.name] = value
-        
+                data[name] = str(value)
+
         return data
     
+    @classmethod
+    def _settable_fields(cls) -> frozenset:
+        """Champs modifiables par from_dict, calculés une fois par classe."""
+        fields = cls.__dict__.get('_settable_fields_cache')
+        if fields is None:
+            fields = frozenset(field.name for field in cls._meta.fields)
+            cls._settable_fields_cache = fields
+        return fields
+
     def from_dict(self, data: Dict[str, Any]) -> None:
         """
         Met à jour l'instance depuis un dictionnaire.
-        
+
         Args:
             data: Dictionnaire avec les nouvelles valeurs
         """
+        settable = type(self)._settable_fields()
+
         for key, value in data.items():
-            if hasattr(self, key):
+            if key in settable:
                 setattr(self, key, value)
 
 
-class ActiveManager(models.Manager):
+class SoftDeleteQuerySet(models.QuerySet):
+    """QuerySet avec suppression logique ensembliste."""
+
+    def delete(self):
+        """
+        Suppression logique en un seul UPDATE.
+
+        Remplace N appels save() par une seule requête ensembliste,
+        ce qui ramène les allers-retours base de données de N à 1.
+        """
+        return self.update(deleted_at=timezone.now())
+
+    def hard_delete(self):
+        """Suppression physique réelle de tout le queryset."""
+        return super().delete()
+
+    def restore(self):
+        """Restaure tous les objets du queryset en un seul UPDATE."""
+        return self.update(deleted_at=None)
+
+
+class ActiveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
     """Manager personnalisé pour filtrer les objets actifs (non supprimés)."""
-    
+
     def get_queryset(self):
-        return super().get_queryset().filter(is_deleted=False)
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class AllObjectsManager(models.Manager):
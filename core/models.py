@@ -3,10 +3,44 @@ Modèles de base pour l'app core.
 Contient les objets de collection échangés sur le marché.
 """
 
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Avg, Sum
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from typing import Dict, Any
 
+from .utils import _json_default, orjson
+
+
+class OrjsonJSONField(models.JSONField):
+    """
+    JSONField encodé/décodé via orjson quand il est disponible.
+
+    L'encodage C d'orjson est nettement plus rapide que json stdlib sur
+    les charges larges (résumés de résultats, additional_data des
+    métriques), le coût dominant par ligne des insertions en lot. Sans
+    orjson, le comportement du JSONField standard est conservé.
+    """
+
+    def get_prep_value(self, value):
+        if value is None or orjson is None:
+            return super().get_prep_value(value)
+        return orjson.dumps(
+            value, default=_json_default, option=orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+
+    def from_db_value(self, value, expression, connection):
+        if value is not None and orjson is not None and isinstance(value, (str, bytes)):
+            try:
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
+                pass
+        return super().from_db_value(value, expression, connection)
+
 
 class ItemCategory(models.TextChoices):
     """Catégories d'objets de collection."""
@@ -18,6 +52,49 @@ class ItemCategory(models.TextChoices):
     OTHER = 'other', 'Autres'
 
 
+class DeletionLog(models.Model):
+    """
+    Journal append-only des suppressions physiques (tombstones).
+
+    Conserve une copie sérialisée des lignes purgées pour que la table
+    principale ne garde que les données chaudes, tout en permettant une
+    restauration manuelle depuis le journal.
+    """
+
+    model_label = models.CharField(
+        max_length=100,
+        verbose_name="Modèle",
+        help_text="Label app.Model de l'objet supprimé"
+    )
+
+    object_pk = models.CharField(
+        max_length=64,
+        verbose_name="Clé primaire"
+    )
+
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Données de l'objet"
+    )
+
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Date de suppression"
+    )
+
+    class Meta:
+        verbose_name = "Journal de suppression"
+        verbose_name_plural = "Journaux de suppression"
+        ordering = ['-deleted_at']
+        indexes = [
+            models.Index(fields=['model_label', 'object_pk']),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model_label}#{self.object_pk} supprimé le {self.deleted_at}"
+
+
 class Item(models.Model):
     """
     Modèle représentant un objet de collection.
@@ -72,7 +149,7 @@ class Item(models.Model):
         verbose_name_plural = "Objets de collection"
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['category', 'name']),
+            models.Index(fields=['category', '-created_at']),
             models.Index(fields=['created_at']),
         ]
     
@@ -85,44 +162,74 @@ class Item(models.Model):
     def get_market_data(self) -> Dict[str, Any]:
         """
         Récupère les données de marché pour cet objet.
-        
+
+        Le résultat est mis en cache ; le cache est invalidé par signal
+        à chaque nouvelle transaction sur l'objet (voir market.signals).
+
         Returns:
             Dict contenant les informations de marché
         """
+        cache_key = f'market_data:{self.pk}'
+        data = cache.get(cache_key)
+
+        if data is None:
+            data = self._compute_market_data()
+            cache.set(cache_key, data, settings.MARKET_DATA_CACHE_TTL)
+
+        return data
+
+    def _compute_market_data(self) -> Dict[str, Any]:
+        """Calcule les données de marché depuis la base."""
         from market.models import Transaction
-        
-        recent_transactions = Transaction.objects.filter(
-            item=self
-        ).order_by('-timestamp')[:10]
-        
-        if not recent_transactions.exists():
+
+        # Derniers prix uniquement (pas d'instanciation de modèles complets)
+        recent_prices = list(
+            Transaction.objects.filter(item=self)
+            .order_by('-timestamp')
+            .values_list('price', flat=True)[:6]
+        )
+
+        if not recent_prices:
             return {
                 'last_price': None,
                 'avg_price_24h': None,
                 'volume_24h': 0,
                 'price_trend': 'stable'
             }
-        
-        prices = [t.price for t in recent_transactions]
-        quantities = [t.quantity for t in recent_transactions]
-        
+
+        # Agrégation 24h calculée côté base de données
+        window_start = timezone.now() - timedelta(hours=24)
+        aggregates = Transaction.objects.filter(
+            item=self,
+            timestamp__gte=window_start
+        ).aggregate(
+            avg_price=Avg('price'),
+            volume=Sum('quantity')
+        )
+
         return {
-            'last_price': prices[0] if prices else None,
-            'avg_price_24h': sum(prices) / len(prices) if prices else None,
-            'volume_24h': sum(quantities),
-            'price_trend': self._calculate_trend(prices)
+            'last_price': recent_prices[0],
+            'avg_price_24h': aggregates['avg_price'],
+            'volume_24h': aggregates['volume'] or 0,
+            'price_trend': self._calculate_trend(recent_prices)
         }
     
     def _calculate_trend(self, prices: list) -> str:
         """Calcule la tendance des prix."""
-        if len(prices) < 2:
+        n = len(prices)
+        if n < 2:
             return 'stable'
-        
-        recent_avg = sum(prices[:3]) / min(3, len(prices))
-        older_avg = sum(prices[3:6]) / max(1, len(prices[3:6]))
-        
-        if recent_avg > older_avg * 1.05:
+
+        # Conversion float unique : évite les opérations mixtes Decimal/float
+        recent_avg = float(sum(prices[:3])) / min(3, n)
+        older_avg = float(sum(prices[3:6])) / (n - 3) if n > 3 else recent_avg
+
+        if older_avg <= 0:
+            return 'stable'
+
+        ratio = recent_avg / older_avg
+        if ratio > 1.05:
             return 'up'
-        elif recent_avg < older_avg * 0.95:
+        elif ratio < 0.95:
             return 'down'
         return 'stable'
@@ -4,26 +4,44 @@ Utilitaires et fonctions helper pour l'application.
 
 import json
 import random
+import secrets
+import statistics
+import time
+from bisect import bisect_right
 from datetime import datetime
+from itertools import accumulate
 from decimal import Decimal
 from pathlib import Path
 from typing import Dict, List, Any, Union, Optional
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj):
+    """Conversion des types non natifs (Decimal, datetime, modèles)."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, Decimal):
+        return float(obj)
+    elif hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Type non sérialisable: {type(obj)}")
+
+
 class JSONEncoder(json.JSONEncoder):
     """Encodeur JSON personnalisé pour les types Django."""
-    
+
     def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, Decimal):
-            return float(obj)
-        elif hasattr(obj, 'to_dict'):
-            return obj.to_dict()
-        return super().default(obj)
+        try:
+            return _json_default(obj)
+        except TypeError:
+            return super().default(obj)
 
 
 def save_json(data: Dict[str, Any], filepath: Union[str, Path]) -> bool:
@@ -40,10 +58,16 @@ def save_json(data: Dict[str, Any], filepath: Union[str, Path]) -> bool:
     try:
         filepath = Path(filepath)
         filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, cls=JSONEncoder, indent=2, ensure_ascii=False)
-        
+
+        if orjson is not None:
+            # Encodage C natif (datetime inclus), ~5-10x plus rapide
+            filepath.write_bytes(
+                orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2)
+            )
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, cls=JSONEncoder, indent=2, ensure_ascii=False)
+
         logger.info(f"Données sauvegardées dans {filepath}")
         return True
         
@@ -63,9 +87,12 @@ def load_json(filepath: Union[str, Path]) -> Optional[Dict[str, Any]]:
         Dict avec les données ou None si erreur
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
+        if orjson is not None:
+            data = orjson.loads(Path(filepath).read_bytes())
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
         logger.info(f"Données chargées depuis {filepath}")
         return data
         
@@ -80,86 +107,201 @@ def load_json(filepath: Union[str, Path]) -> Optional[Dict[str, Any]]:
         return None
 
 
+def encode_jsonl(record: Dict[str, Any]) -> bytes:
+    """
+    Encode un enregistrement en une ligne NDJSON (octets, saut inclus).
+
+    Préfère orjson quand il est disponible, comme save_json ; les flux
+    ouverts en mode binaire peuvent écrire le résultat tel quel.
+    """
+    if orjson is not None:
+        # OPT_NON_STR_KEYS : les inventaires d'agents sont indexés par
+        # item_id entier
+        return orjson.dumps(
+            record, default=_json_default,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        )
+    return (json.dumps(record, cls=JSONEncoder, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def append_jsonl(record: Dict[str, Any], filepath: Union[str, Path]) -> bool:
+    """
+    Ajoute un enregistrement à un fichier NDJSON (append-only).
+
+    Écriture O(1) par enregistrement : contrairement à save_json, le
+    fichier n'est jamais réécrit en entier.
+
+    Args:
+        record: Enregistrement à ajouter
+        filepath: Chemin du fichier de destination
+
+    Returns:
+        True si succès, False sinon
+    """
+    try:
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+
+        line = encode_jsonl(record)
+
+        with open(filepath, 'ab') as f:
+            f.write(line)
+
+        return True
+
+    except Exception as e:
+        logger.error(f"Erreur lors de l'ajout NDJSON: {e}")
+        return False
+
+
+def load_jsonl(filepath: Union[str, Path]):
+    """
+    Itère les enregistrements d'un fichier NDJSON.
+
+    Args:
+        filepath: Chemin du fichier à charger
+
+    Yields:
+        Dict par ligne, en mémoire constante
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield orjson.loads(line) if orjson is not None else json.loads(line)
+
+    except FileNotFoundError:
+        logger.warning(f"Fichier non trouvé: {filepath}")
+    except (json.JSONDecodeError, ValueError) as e:
+        logger.error(f"Erreur de format JSON: {e}")
+
+
 def generate_simulation_id() -> str:
     """Génère un ID unique pour une simulation."""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    random_suffix = random.randint(1000, 9999)
-    return f"sim_{timestamp}_{random_suffix}"
+    # Préfixe monotone (ns) + suffixe cryptographique : pas de formatage
+    # strftime ni de collision entre workers parallèles
+    return f"sim_{time.time_ns()}_{secrets.token_hex(4)}"
+
+
+def decimal_to_cents(price: Decimal) -> int:
+    """Convertit un prix Decimal en centimes entiers."""
+    return int((price * 100).quantize(Decimal('1')))
+
+
+def cents_to_decimal(cents: int) -> Decimal:
+    """Convertit des centimes entiers en prix Decimal."""
+    return Decimal(cents).scaleb(-2)
+
+
+def calculate_price_bounds_cents(cents: int, vol_bp: int = 1000) -> tuple:
+    """
+    Calcule les bornes de prix en centimes entiers.
+
+    Arithmétique entière pure pour les boucles chaudes : pas de contexte
+    Decimal ni de bignum par opération.
+
+    Args:
+        cents: Prix actuel en centimes
+        vol_bp: Volatilité en points de base (1000 = 10%)
+
+    Returns:
+        Tuple (min_cents, max_cents)
+    """
+    variation = cents * vol_bp // 10000
+    return (max(cents - variation, 1), cents + variation)
 
 
 def calculate_price_bounds(current_price: Decimal, volatility: float = 0.1) -> tuple:
     """
     Calcule les bornes de prix pour les ordres.
-    
+
     Args:
         current_price: Prix actuel
         volatility: Volatilité (pourcentage de variation)
-        
+
     Returns:
         Tuple (prix_min, prix_max)
     """
     if current_price <= 0:
         return (Decimal('1.0'), Decimal('100.0'))
-    
-    variation = current_price * Decimal(str(volatility))
-    price_min = max(current_price - variation, Decimal('0.01'))
-    price_max = current_price + variation
-    
-    return (price_min, price_max)
+
+    # Conversion Decimal aux bornes uniquement, calcul en centimes entiers
+    min_cents, max_cents = calculate_price_bounds_cents(
+        decimal_to_cents(current_price), int(volatility * 10000)
+    )
+
+    return (cents_to_decimal(min_cents), cents_to_decimal(max_cents))
+
+
+class WeightedSampler:
+    """
+    Échantillonneur pondéré avec CDF précalculée.
+
+    À construire une fois quand les poids sont stables : chaque tirage
+    est une recherche binaire O(log n) au lieu du balayage linéaire
+    de weighted_random_choice.
+    """
+
+    def __init__(self, choices: List[tuple]):
+        """
+        Args:
+            choices: Liste de tuples (valeur, poids)
+        """
+        self.values = tuple(value for value, _ in choices)
+        self._cdf = list(accumulate(weight for _, weight in choices))
+
+    def sample(self) -> Any:
+        """Tire une valeur selon les poids."""
+        if not self.values:
+            return None
+
+        total = self._cdf[-1]
+        if total <= 0:
+            return random.choice(self.values)
+
+        index = bisect_right(self._cdf, random.random() * total)
+        return self.values[min(index, len(self.values) - 1)]
 
 
 def weighted_random_choice(choices: List[tuple]) -> Any:
     """
     Sélection aléatoire pondérée.
-    
+
     Args:
         choices: Liste de tuples (valeur, poids)
-        
+
     Returns:
         Valeur sélectionnée
     """
     if not choices:
         return None
-    
-    total_weight = sum(weight for _, weight in choices)
-    if total_weight <= 0:
-        return random.choice([value for value, _ in choices])
-    
-    r = random.uniform(0, total_weight)
-    cumulative = 0
-    
-    for value, weight in choices:
-        cumulative += weight
-        if r <= cumulative:
-            return value
-    
-    # Fallback
-    return choices[-1][0]
+
+    return WeightedSampler(choices).sample()
 
 
 class SimulationTimer:
     """Utilitaire pour mesurer les performances des simulations."""
-    
+
     def __init__(self, name: str):
         self.name = name
-        self.start_time = None
-        self.end_time = None
-    
+        self.start_ns = None
+        self.end_ns = None
+
     def __enter__(self):
-        self.start_time = datetime.now()
+        # Horloge monotone entière : pas d'allocation datetime ni de tzinfo
+        self.start_ns = time.perf_counter_ns()
         logger.info(f"Début de {self.name}")
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.end_time = datetime.now()
-        duration = self.end_time - self.start_time
-        logger.info(f"Fin de {self.name} - Durée: {duration}")
-    
+        self.end_ns = time.perf_counter_ns()
+        logger.info(f"Fin de {self.name} - Durée: {self.duration:.3f}s")
+
     @property
     def duration(self) -> float:
         """Durée en secondes."""
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
+        if self.start_ns is not None and self.end_ns is not None:
+            return (self.end_ns - self.start_ns) / 1e9
         return 0.0
 
 
@@ -191,16 +333,14 @@ def calculate_statistics(values: List[Union[int, float, Decimal]]) -> Dict[str,
     """
     if not values:
         return {'min': 0, 'max': 0, 'mean': 0, 'median': 0, 'count': 0}
-    
+
+    # Boucles déléguées aux implémentations C (min/max/fmean/median)
     values = [float(v) for v in values]
-    values.sort()
-    
-    n = len(values)
-    
+
     return {
-        'min': values[0],
-        'max': values[-1],
-        'mean': sum(values) / n,
-        'median': values[n // 2] if n % 2 == 1 else (values[n // 2 - 1] + values[n // 2]) / 2,
-        'count': n
+        'min': min(values),
+        'max': max(values),
+        'mean': statistics.fmean(values),
+        'median': statistics.median(values),
+        'count': len(values)
     }
\ No newline at end of file
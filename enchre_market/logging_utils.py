@@ -0,0 +1,31 @@
+"""
+Handlers de logging non bloquants pour la configuration LOGGING.
+"""
+
+import atexit
+import logging.handlers
+import queue
+
+
+class QueueListenerHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler autonome adossé à un QueueListener en arrière-plan.
+
+    L'appel de log depuis les threads de simulation/requête devient une
+    simple mise en file (microsecondes) ; l'écriture disque est faite par
+    le thread du listener via un RotatingFileHandler.
+    """
+
+    def __init__(self, filename, max_bytes=50 * 1024 * 1024, backup_count=5):
+        log_queue = queue.Queue(-1)
+        super().__init__(log_queue)
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            filename, maxBytes=max_bytes, backupCount=backup_count
+        )
+
+        self._listener = logging.handlers.QueueListener(
+            log_queue, file_handler, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self._listener.stop)
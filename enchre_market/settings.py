@@ -87,6 +87,37 @@ else:
         }
     }
 
+# Connexions persistantes : évite le coût d'ouverture (TLS, auth) à chaque
+# requête ; en production, combiner avec pgbouncer en mode transaction
+DATABASES['default']['CONN_MAX_AGE'] = config('CONN_MAX_AGE', default=600, cast=int)
+
+# Cache Configuration
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    # Production Redis
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    # Development in-process fallback
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'enchre-market',
+        }
+    }
+
+# TTL du cache des données de marché (invalidé aussi par signal)
+MARKET_DATA_CACHE_TTL = config('MARKET_DATA_CACHE_TTL', default=60, cast=int)
+
+# Mode de matching : 'immediate' croise chaque ordre à la soumission,
+# 'scheduled' met les soumissions en file et croise au prochain match_orders()
+MATCHING_MODE = config('MATCHING_MODE', default='immediate')
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -170,7 +201,8 @@ LOGGING = {
             'formatter': 'simple',
         },
         'file': {
-            'class': 'logging.FileHandler',
+            # Mise en file non bloquante, écriture disque en thread dédié
+            'class': 'enchre_market.logging_utils.QueueListenerHandler',
             'filename': BASE_DIR / 'logs' / 'simulation.log',
             'formatter': 'verbose',
         },
@@ -3,6 +3,8 @@ Interface d'administration pour l'app market.
 """
 
 from django.contrib import admin
+from django.db.models import DecimalField, ExpressionWrapper, F
+
 from .models import Order, Transaction, MarketSnapshot
 
 
@@ -15,6 +17,7 @@ class OrderAdmin(admin.ModelAdmin):
         'quantity', 'filled_quantity', 'status', 'created_at'
     ]
     list_filter = ['order_type', 'status', 'item__category', 'created_at']
+    list_select_related = ('item',)
     search_fields = ['agent_id', 'item__name']
     ordering = ['-created_at']
     readonly_fields = ['created_at', 'updated_at', 'filled_quantity']
@@ -45,13 +48,26 @@ class TransactionAdmin(admin.ModelAdmin):
         'quantity', 'total_value', 'timestamp'
     ]
     list_filter = ['item__category', 'timestamp']
+    list_select_related = ('item',)
     search_fields = ['buyer_id', 'seller_id', 'item__name']
     ordering = ['-timestamp']
     readonly_fields = ['timestamp', 'total_value']
     
+    def get_queryset(self, request):
+        # Valeur totale calculée en SQL : lecture de colonne par ligne et
+        # tri possible côté base, au lieu d'une multiplication Python par ligne
+        queryset = super().get_queryset(request)
+        return queryset.annotate(
+            _total_value=ExpressionWrapper(
+                F('price') * F('quantity'),
+                output_field=DecimalField(max_digits=12, decimal_places=2)
+            )
+        )
+
     def total_value(self, obj):
-        return f"{obj.total_value:.2f}€"
+        return f"{obj._total_value:.2f}€"
     total_value.short_description = "Valeur totale"
+    total_value.admin_order_field = '_total_value'
 
 
 @admin.register(MarketSnapshot)
@@ -63,6 +79,7 @@ class MarketSnapshotAdmin(admin.ModelAdmin):
         'volume_24h', 'created_at'
     ]
     list_filter = ['item__category', 'created_at']
+    list_select_related = ('item',)
     search_fields = ['item__name']
     ordering = ['-created_at']
     readonly_fields = ['created_at', 'updated_at']
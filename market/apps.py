@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class MarketConfig(AppConfig):
     name = 'market'
+
+    def ready(self):
+        """Connecte les signaux d'invalidation de cache."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,111 @@
+"""
+Carnet d'ordres en mémoire à niveaux de prix.
+
+Structure prix-temps classique : chaque côté du carnet maintient ses
+niveaux de prix triés (accès au meilleur prix en O(1)) et une file FIFO
+d'ordres par niveau. La base de données reste la source de vérité pour
+la durabilité ; le carnet sert les lectures chaudes sans requête SQL.
+"""
+
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional
+
+from .models import Order, OrderType
+
+
+class BookSide:
+    """
+    Un côté du carnet (achats ou ventes).
+
+    Les niveaux de prix sont indexés en ticks entiers (centimes) : les
+    comparaisons et le tri se font en int natif, jamais en Decimal.
+    L'ordre des niveaux est maintenu dans une liste triée par bisect :
+    insertion O(log P), meilleur prix O(1), P étant le nombre de niveaux
+    distincts.
+    """
+
+    def __init__(self):
+        self._levels: Dict[int, Deque[Order]] = {}
+        self._prices: List[int] = []  # Ticks triés par ordre croissant
+        self._id_map: Dict[int, int] = {}  # order_id -> ticks de son niveau
+
+    def __len__(self) -> int:
+        return len(self._id_map)
+
+    def add(self, order: Order) -> None:
+        """Ajoute un ordre en fin de file de son niveau de prix."""
+        ticks = order.price_ticks
+        level = self._levels.get(ticks)
+        if level is None:
+            level = self._levels[ticks] = deque()
+            insort(self._prices, ticks)
+        level.append(order)
+        self._id_map[order.id] = ticks
+
+    def remove(self, order: Order) -> bool:
+        """Retire un ordre de son niveau de prix."""
+        ticks = self._id_map.pop(order.id, None)
+        if ticks is None:
+            return False
+
+        level = self._levels[ticks]
+        level.remove(order)
+
+        if not level:
+            del self._levels[ticks]
+            del self._prices[bisect_left(self._prices, ticks)]
+        return True
+
+    def __contains__(self, order: Order) -> bool:
+        # Membership en O(1) via l'id, pas de scan du niveau
+        return order.id in self._id_map
+
+    def best_price(self, highest: bool) -> Optional[int]:
+        """Meilleur prix du côté, en ticks (None si vide)."""
+        if not self._prices:
+            return None
+        return self._prices[-1] if highest else self._prices[0]
+
+    def iter_orders(self, best_first_highest: bool) -> Iterator[Order]:
+        """Itère les ordres en priorité prix puis temps."""
+        prices = reversed(self._prices) if best_first_highest else iter(self._prices)
+        for price in list(prices):
+            yield from list(self._levels[price])
+
+
+class OrderBook:
+    """
+    Carnet d'ordres d'un objet de collection.
+
+    Attributes:
+        item_id: ID de l'objet concerné
+        bids: Côté achat (meilleur prix = plus haut)
+        asks: Côté vente (meilleur prix = plus bas)
+    """
+
+    def __init__(self, item_id: int):
+        self.item_id = item_id
+        self.bids = BookSide()
+        self.asks = BookSide()
+
+    def _side_for(self, order: Order) -> BookSide:
+        return self.bids if order.order_type == OrderType.BUY else self.asks
+
+    def add(self, order: Order) -> None:
+        """Ajoute un ordre actif au carnet (sans doublon)."""
+        side = self._side_for(order)
+        if order not in side:
+            side.add(order)
+
+    def remove(self, order: Order) -> bool:
+        """Retire un ordre du carnet (annulation ou exécution complète)."""
+        return self._side_for(order).remove(order)
+
+    def best_bid(self) -> Optional[int]:
+        """Meilleur prix d'achat en ticks, O(1)."""
+        return self.bids.best_price(highest=True)
+
+    def best_ask(self) -> Optional[int]:
+        """Meilleur prix de vente en ticks, O(1)."""
+        return self.asks.best_price(highest=False)
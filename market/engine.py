@@ -2,18 +2,88 @@
 Moteur de marché pour l'exécution des ordres et le matching.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from collections import deque
+from typing import Deque, List, Dict, Any, Optional, Tuple
 from decimal import Decimal
-from django.db import transaction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F, Max, Min, Sum, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
+import json
 import logging
+import threading
+import time
 
-from .models import Order, Transaction, MarketSnapshot, OrderType, OrderStatus
+from core.utils import orjson
+
+from .book import OrderBook
+from .models import ACTIVE_STATUSES, Order, Transaction, MarketSnapshot, OrderType, OrderStatus
 from core.models import Item
 
 logger = logging.getLogger('market')
 
 
+def _orders_to_dicts(orders):
+    """
+    Convertit les ordres du carnet en dicts sérialisables.
+
+    Le corps de boucle ne touche que des locales : append est pré-lié
+    hors boucle et l'arithmétique reste en ticks entiers, la conversion
+    float n'intervenant qu'en sortie.
+    """
+    result = []
+    append = result.append
+    for order in orders:
+        remaining = order.quantity - order.filled_quantity
+        if remaining <= 0:
+            continue
+        ticks = order.price_ticks
+        append({
+            'id': order.id,
+            'price': ticks / 100.0,
+            'quantity': remaining,
+            'total': (ticks * remaining) / 100.0,
+            'created_at': order.created_at.isoformat()
+        })
+    return result
+
+
+class _VolumeWindow:
+    """
+    Fenêtre glissante 24h de volume, maintenue incrémentalement.
+
+    Chaque fill ajoute (timestamp, quantité, valeur en ticks) ; la
+    lecture n'expire que les entrées sorties de la fenêtre au lieu de
+    réagréger toutes les transactions des dernières 24h.
+    """
+
+    WINDOW_SECONDS = 86400.0
+
+    __slots__ = ('entries', 'quantity', 'value_ticks')
+
+    def __init__(self):
+        self.entries: Deque[Tuple[float, int, int]] = deque()
+        self.quantity = 0
+        self.value_ticks = 0
+
+    def add(self, ts: float, quantity: int, value_ticks: int) -> None:
+        """Enregistre un fill dans la fenêtre."""
+        self.entries.append((ts, quantity, value_ticks))
+        self.quantity += quantity
+        self.value_ticks += value_ticks
+
+    def expire(self, now: float) -> None:
+        """Retire les entrées sorties de la fenêtre et ajuste les compteurs."""
+        cutoff = now - self.WINDOW_SECONDS
+        entries = self.entries
+        while entries and entries[0][0] < cutoff:
+            _, quantity, value_ticks = entries.popleft()
+            self.quantity -= quantity
+            self.value_ticks -= value_ticks
+
+
 class MarketEngine:
     """
     Moteur de marché responsable de l'exécution des ordres.
@@ -27,37 +97,156 @@ class MarketEngine:
     
     def __init__(self):
         """Initialise le moteur de marché."""
-        self._order_books: Dict[int, Dict[str, List[Order]]] = {}
+        self._books: Dict[int, OrderBook] = {}
         self._market_data: Dict[int, Dict[str, Any]] = {}
+        # Files des soumissions en attente par item_id (mode
+        # 'scheduled') : la réception est découplée du croisement, et
+        # le drainage se fait actif par actif au point de synchro du
+        # tick — la CDA ne couple pas les actifs entre eux
+        self._pending_by_item: Dict[int, Deque[Order]] = {}
+        # Fenêtres glissantes 24h de volume par item_id
+        self._vol24h: Dict[int, _VolumeWindow] = {}
+        # Convertisseur d'ordres pré-lié en attribut d'instance
+        self._orders_to_dicts = _orders_to_dicts
+        # Tampon circulaire des fills à publier (les plus anciens sont
+        # écrasés si aucun consommateur ne draine)
+        self._fill_ring: Deque[Transaction] = deque(maxlen=1 << 16)
+        # Dernier prix d'exécution par item_id (Decimal)
+        self._last_trade: Dict[int, Decimal] = {}
+        # Tampon de travail réutilisé entre les croisements pour les
+        # ordres touchés (jamais exposé aux appelants) ; suppose un seul
+        # worker de matching par moteur, comme le reste de l'état chaud
+        self._touched_scratch: List[Order] = []
+
+    def _get_book(self, item_id: int) -> OrderBook:
+        """
+        Récupère le carnet en mémoire d'un objet.
+
+        Au premier accès (démarrage à froid), le carnet est hydraté
+        depuis la base avec les ordres encore actifs de l'objet.
+        """
+        book = self._books.get(item_id)
+        if book is None:
+            book = self._books[item_id] = OrderBook(item_id)
+            active_orders = Order.objects.filter(
+                item_id=item_id,
+                status__in=ACTIVE_STATUSES,
+                filled_quantity__lt=F('quantity')
+            ).order_by('created_at')
+            for resting in active_orders:
+                book.add(resting)
+        return book
     
     def submit_order(self, order: Order) -> Order:
         """
         Soumet un ordre sur le marché.
         
         Args:
-            order: Ordre à soumettre
-            
+            order: Ordre à soumettre (Order, ou tout objet exposant
+                to_order() comme simulation.orders.CandidateOrder)
+
         Returns:
             L'ordre sauvegardé et potentiellement exécuté
         """
-        logger.info(f"Soumission d'ordre: {order}")
+        # Les candidats légers ne sont matérialisés en modèle qu'ici
+        if not isinstance(order, Order):
+            order = order.to_order()
+
+        # Formatage paresseux : Order.__str__ (qui déréférence item.name)
+        # n'est évalué que si le niveau INFO est actif
+        logger.info("Soumission d'ordre: %s", order)
         
         with transaction.atomic():
             # Sauvegarde de l'ordre
             order.save()
-            
+
+            # Mode 'scheduled' : mise en file, croisement différé au
+            # prochain match_orders()
+            if settings.MATCHING_MODE == 'scheduled':
+                self._enqueue_pending(order)
+                self._update_order_book(order)
+                return order
+
             # Tentative de matching
             matching_orders = self._find_matching_orders(order)
             
             if matching_orders:
                 transactions = self._execute_matches(order, matching_orders)
-                logger.info(f"Ordre partiellement/complètement exécuté: {len(transactions)} transactions")
+                logger.info("Ordre partiellement/complètement exécuté: %d transactions", len(transactions))
             
             # Mise à jour du carnet d'ordres
             self._update_order_book(order)
             
             return order
     
+    def submit_orders(self, orders: List[Order]) -> List[Order]:
+        """
+        Soumet un lot d'ordres en une seule transaction.
+
+        Le lot est persisté par un unique bulk_create puis chaque ordre
+        est croisé : le coût transactionnel et aller-retour par INSERT
+        est amorti sur tout le lot (cas type : tous les ordres produits
+        par un tick de simulation).
+
+        Args:
+            orders: Ordres à soumettre, dans l'ordre de priorité temps
+
+        Returns:
+            Les ordres soumis (statuts/quantités mis à jour)
+        """
+        if not orders:
+            return []
+
+        scheduled = settings.MATCHING_MODE == 'scheduled'
+
+        with transaction.atomic():
+            Order.objects.bulk_create(orders, batch_size=500)
+
+            for order in orders:
+                if scheduled:
+                    self._enqueue_pending(order)
+                    self._update_order_book(order)
+                    continue
+
+                matching_orders = self._find_matching_orders(order)
+                if matching_orders:
+                    self._execute_matches(order, matching_orders)
+                self._update_order_book(order)
+
+        # bulk_create ne déclenche pas post_save : invalidation explicite
+        # des instantanés des objets touchés
+        cache.delete_many({f'mkt:snap:{order.item_id}' for order in orders})
+
+        return orders
+
+    def _enqueue_pending(self, order: Order) -> None:
+        """Met un ordre en file d'attente de croisement pour son objet."""
+        queue = self._pending_by_item.get(order.item_id)
+        if queue is None:
+            queue = self._pending_by_item[order.item_id] = deque()
+        queue.append(order)
+
+    def _drain_item_queue(self, queue: Deque[Order]) -> List[Transaction]:
+        """
+        Croise la file d'attente d'un seul objet.
+
+        Unité de travail du drainage par actif : indépendante des autres
+        objets, elle pourrait être distribuée sur un exécuteur parallèle
+        avec une base qui accepte les écrivains concurrents — SQLite
+        n'en accepte qu'un, le drainage reste donc séquentiel ici.
+        """
+        transactions: List[Transaction] = []
+        while queue:
+            order = queue.popleft()
+            if order.is_active and order.remaining_quantity > 0:
+                matching_orders = self._find_matching_orders(order)
+                if matching_orders:
+                    transactions.extend(
+                        self._execute_matches(order, matching_orders)
+                    )
+            self._update_order_book(order)
+        return transactions
+
     def _find_matching_orders(self, new_order: Order) -> List[Order]:
         """
         Trouve les ordres compatibles avec le nouvel ordre.
@@ -74,8 +263,17 @@ class MarketEngine:
         matching_orders = Order.objects.filter(
             item=new_order.item,
             order_type=opposite_type,
-            status__in=[OrderStatus.PENDING, OrderStatus.PARTIAL]
+            status__in=ACTIVE_STATUSES,
+            # Profondeur restante exprimée en SQL : les lignes déjà
+            # complètement exécutées ne sont même pas ramenées
+            filled_quantity__lt=F('quantity')
         ).exclude(agent_id=new_order.agent_id)
+
+        # Verrouillage des candidats pour les soumissions concurrentes :
+        # deux workers ne peuvent pas croiser le même ordre au repos.
+        # SKIP LOCKED évite l'attente (PostgreSQL ; ignoré sous SQLite)
+        if connection.features.has_select_for_update_skip_locked:
+            matching_orders = matching_orders.select_for_update(skip_locked=True)
         
         # Filtrage par prix compatible
         if new_order.order_type == OrderType.BUY:
@@ -103,78 +301,178 @@ class MarketEngine:
             Liste des transactions créées
         """
         transactions = []
+        touched_orders = self._touched_scratch
+        touched_orders.clear()
+        append_transaction = transactions.append
+        append_touched = touched_orders.append
+
+        # Invariants de boucle hoïstés : le côté, l'objet et l'agent du
+        # nouvel ordre ne changent pas pendant le croisement
+        new_is_buy = new_order.order_type == OrderType.BUY
+        item_id = new_order.item_id
+        new_agent_id = new_order.agent_id
         remaining_quantity = new_order.remaining_quantity
-        
+        log_fills = logger.isEnabledFor(logging.INFO)
+
         for matching_order in matching_orders:
             if remaining_quantity <= 0:
                 break
-            
-            # Calcul de la quantité à échanger
-            trade_quantity = min(remaining_quantity, matching_order.remaining_quantity)
-            
-            # Détermination du prix d'exécution (prix de l'ordre existant)
-            execution_price = matching_order.price
-            
-            # Création de la transaction
-            if new_order.order_type == OrderType.BUY:
-                buyer_id = new_order.agent_id
-                seller_id = matching_order.agent_id
-                buy_order = new_order
-                sell_order = matching_order
+
+            # Calcul de la quantité à échanger (en ints natifs)
+            matching_remaining = matching_order.quantity - matching_order.filled_quantity
+            trade_quantity = remaining_quantity if remaining_quantity < matching_remaining else matching_remaining
+
+            # Création de la transaction (non sauvegardée, flush en batch)
+            # au prix de l'ordre existant
+            if new_is_buy:
+                append_transaction(Transaction(
+                    buyer_id=new_agent_id,
+                    seller_id=matching_order.agent_id,
+                    item_id=item_id,
+                    price=matching_order.price,
+                    quantity=trade_quantity,
+                    buy_order=new_order,
+                    sell_order=matching_order
+                ))
             else:
-                buyer_id = matching_order.agent_id
-                seller_id = new_order.agent_id
-                buy_order = matching_order
-                sell_order = new_order
-            
-            transaction_obj = Transaction.objects.create(
-                buyer_id=buyer_id,
-                seller_id=seller_id,
-                item=new_order.item,
-                price=execution_price,
-                quantity=trade_quantity,
-                buy_order=buy_order,
-                sell_order=sell_order
-            )
-            
+                append_transaction(Transaction(
+                    buyer_id=matching_order.agent_id,
+                    seller_id=new_agent_id,
+                    item_id=item_id,
+                    price=matching_order.price,
+                    quantity=trade_quantity,
+                    buy_order=matching_order,
+                    sell_order=new_order
+                ))
+
             # Mise à jour des quantités exécutées
             new_order.filled_quantity += trade_quantity
             matching_order.filled_quantity += trade_quantity
-            
+
             # Mise à jour des statuts
             new_order.update_status()
             matching_order.update_status()
-            
-            new_order.save()
-            matching_order.save()
-            
-            transactions.append(transaction_obj)
+
+            append_touched(matching_order)
             remaining_quantity -= trade_quantity
-            
-            logger.info(f"Transaction exécutée: {trade_quantity}x {new_order.item.name} @ {execution_price}€")
-        
+
+            if log_fills:
+                logger.info("Transaction exécutée: %dx item=%d @ %s€",
+                            trade_quantity, item_id, matching_order.price)
+
+        if transactions:
+            # Fenêtre 24h amorcée avant le flush pour ne pas compter
+            # deux fois les transactions de ce croisement
+            window = self._get_volume_window(item_id)
+
+            # 2 requêtes quel que soit le nombre de fills, au lieu de 3 par fill
+            touched_orders.append(new_order)
+            Transaction.objects.bulk_create(transactions, batch_size=500)
+
+            now_ts = time.time()
+            for tx in transactions:
+                window.add(now_ts, tx.quantity, int(tx.price * 100) * tx.quantity)
+
+            # Publication différée : simple extend sur le tampon, la
+            # sérialisation/diffusion se fait hors du chemin critique
+            self._fill_ring.extend(transactions)
+
+            # Dernier prix exécuté et retrait du carnet des ordres au
+            # repos complètement exécutés
+            self._last_trade[item_id] = transactions[-1].price
+            book = self._books.get(item_id)
+            if book is not None:
+                for touched in touched_orders:
+                    if not touched.is_active:
+                        book.remove(touched)
+            Order.objects.bulk_update(
+                touched_orders, ['filled_quantity', 'status'], batch_size=500
+            )
+
+            # bulk_create ne déclenche pas post_save : invalidation explicite
+            cache.delete_many([
+                f'market_data:{new_order.item_id}',
+                f'mkt:snap:{new_order.item_id}',
+            ])
+
         return transactions
     
+    def drain_fill_events(self, max_events: Optional[int] = None) -> List[Transaction]:
+        """
+        Vide le tampon des fills en attente de publication.
+
+        Le matching ne paie qu'un extend par croisement ; un publieur
+        (thread dédié, tâche périodique) consomme ici par lots et fait
+        la sérialisation/diffusion sans bloquer submit_order.
+
+        Args:
+            max_events: Taille maximale du lot (None = tout drainer)
+
+        Returns:
+            Transactions à publier, dans l'ordre d'exécution
+        """
+        ring = self._fill_ring
+        if max_events is None:
+            events = list(ring)
+            ring.clear()
+            return events
+
+        events = []
+        while ring and len(events) < max_events:
+            events.append(ring.popleft())
+        return events
+
+    def pending_order_count(self) -> int:
+        """
+        Nombre d'ordres actifs présents dans les carnets en mémoire.
+
+        Compteur O(carnets) sans requête SQL, pour les métriques de
+        tick : chaque ordre soumis par le moteur passe par son carnet,
+        la somme couvre donc toute l'activité de la simulation en cours.
+
+        Returns:
+            Total des ordres actifs côté achat et vente
+        """
+        return sum(
+            len(book.bids) + len(book.asks)
+            for book in self._books.values()
+        )
+
+    def _get_volume_window(self, item_id: int) -> _VolumeWindow:
+        """
+        Récupère la fenêtre 24h d'un objet, amorcée depuis la base.
+
+        L'amorçage (une seule requête, au premier fill de l'objet) charge
+        les transactions encore dans la fenêtre ; ensuite tout est
+        entretenu incrémentalement en mémoire.
+        """
+        window = self._vol24h.get(item_id)
+        if window is None:
+            window = self._vol24h[item_id] = _VolumeWindow()
+            since_24h = timezone.now() - timezone.timedelta(hours=24)
+            rows = Transaction.objects.filter(
+                item_id=item_id,
+                timestamp__gte=since_24h
+            ).order_by('timestamp').values_list('timestamp', 'quantity', 'price')
+            for ts, quantity, price in rows:
+                window.add(ts.timestamp(), quantity, int(price * 100) * quantity)
+        return window
+
     def _update_order_book(self, order: Order) -> None:
         """
         Met à jour le carnet d'ordres en mémoire.
-        
+
         Args:
             order: Ordre à ajouter/mettre à jour
         """
-        item_id = order.item_id
-        
-        if item_id not in self._order_books:
-            self._order_books[item_id] = {'BUY': [], 'SELL': []}
-        
+        book = self._get_book(order.item_id)
+
         # Suppression de l'ordre s'il n'est plus actif
         if not order.is_active:
-            for order_list in self._order_books[item_id].values():
-                if order in order_list:
-                    order_list.remove(order)
-        # Ajout de l'ordre s'il est actif et pas déjà présent
-        elif order not in self._order_books[item_id][order.order_type]:
-            self._order_books[item_id][order.order_type].append(order)
+            book.remove(order)
+        # Ajout de l'ordre s'il est actif (sans doublon)
+        else:
+            book.add(order)
     
     def get_order_book(self, item: Item) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -186,33 +484,38 @@ class MarketEngine:
         Returns:
             Dict avec les listes d'ordres d'achat et de vente
         """
-        # Récupération depuis la base de données pour garantir la fraîcheur
-        buy_orders = Order.objects.filter(
-            item=item,
-            order_type=OrderType.BUY,
-            status__in=[OrderStatus.PENDING, OrderStatus.PARTIAL]
-        ).order_by('-price', 'created_at')
-        
-        sell_orders = Order.objects.filter(
-            item=item,
-            order_type=OrderType.SELL,
-            status__in=[OrderStatus.PENDING, OrderStatus.PARTIAL]
-        ).order_by('price', 'created_at')
-        
-        return {
-            'buy_orders': [self._order_to_dict(order) for order in buy_orders],
-            'sell_orders': [self._order_to_dict(order) for order in sell_orders]
-        }
-    
-    def _order_to_dict(self, order: Order) -> Dict[str, Any]:
-        """Convertit un ordre en dictionnaire."""
+        # Servi depuis le carnet en mémoire (hydraté une fois depuis la
+        # base, tenu à jour par les chemins d'écriture du moteur) :
+        # aucune requête SQL en régime établi
+        book = self._get_book(item.id)
+
         return {
-            'id': order.id,
-            'price': float(order.price),
-            'quantity': order.remaining_quantity,
-            'total': float(order.price * order.remaining_quantity),
-            'created_at': order.created_at.isoformat()
+            'buy_orders': self._orders_to_dicts(
+                book.bids.iter_orders(best_first_highest=True)
+            ),
+            'sell_orders': self._orders_to_dicts(
+                book.asks.iter_orders(best_first_highest=False)
+            )
         }
+
+    def get_order_book_bytes(self, item: Item) -> bytes:
+        """
+        Sérialise le carnet d'ordres en JSON, directement en bytes.
+
+        Pour les consommateurs aval (REST, WebSocket) : orjson si
+        disponible, sinon json standard. Le payload ne contient que des
+        types natifs (ints, floats, str), jamais de Decimal.
+
+        Args:
+            item: Objet concerné
+
+        Returns:
+            Carnet sérialisé en JSON (bytes)
+        """
+        payload = self.get_order_book(item)
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload).encode('utf-8')
     
     def get_market_snapshot(self, item: Item = None) -> Dict[str, Any]:
         """
@@ -226,64 +529,198 @@ class MarketEngine:
         """
         if item:
             return self._get_item_market_data(item)
-        
-        # Données pour tous les objets
-        items = Item.objects.all()
+
+        return self._get_all_market_data()
+
+    def get_market_snapshots(self, items) -> Dict[int, Dict[str, Any]]:
+        """
+        Instantanés de marché d'un ensemble d'objets, en requêtes groupées.
+
+        À utiliser dans les boucles (stratégies d'agents, dashboards) à la
+        place d'un get_market_snapshot(item) par objet : le coût reste de
+        4 requêtes quel que soit le nombre d'objets.
+
+        Args:
+            items: Itérable d'objets Item (liste ou queryset)
+
+        Returns:
+            Dict item_id -> données de marché
+        """
+        return self._get_all_market_data(items=list(items))
+
+    def _get_all_market_data(self, items=None) -> Dict[int, Dict[str, Any]]:
+        """
+        Calcule les données de marché de plusieurs objets en 4 requêtes.
+
+        Remplace l'itération item par item (4 requêtes chacun) par des
+        agrégations groupées par item_id, assemblées en une passe Python.
+
+        Args:
+            items: Objets à couvrir (None = tous)
+
+        Returns:
+            Dict item_id -> données de marché
+        """
+        if items is None:
+            id_name_pairs = list(Item.objects.values_list('id', 'name'))
+        else:
+            id_name_pairs = [(i.id, i.name) for i in items]
+
+        item_ids = [pair[0] for pair in id_name_pairs]
+        order_qs = Order.objects.filter(item_id__in=item_ids)
+        tx_qs = Transaction.objects.filter(item_id__in=item_ids)
+
+        best_bids = {
+            row['item_id']: row['best']
+            for row in order_qs.filter(
+                order_type=OrderType.BUY, status__in=ACTIVE_STATUSES
+            ).values('item_id').annotate(best=Max('price'))
+        }
+
+        best_asks = {
+            row['item_id']: row['best']
+            for row in order_qs.filter(
+                order_type=OrderType.SELL, status__in=ACTIVE_STATUSES
+            ).values('item_id').annotate(best=Min('price'))
+        }
+
+        # Dernier prix exécuté par item_id via fenêtre RowNumber (rn=1) :
+        # borne le résultat à une ligne par objet au lieu de matérialiser
+        # tout l'historique des transactions à chaque appel
+        last_prices: Dict[int, Any] = dict(
+            tx_qs.annotate(rn=Window(
+                RowNumber(),
+                partition_by=F('item_id'),
+                order_by=F('timestamp').desc(),
+            ))
+            .filter(rn=1)
+            .values_list('item_id', 'price')
+        )
+
+        since_24h = timezone.now() - timezone.timedelta(hours=24)
+        volumes_24h = {
+            row['item_id']: row
+            for row in tx_qs.filter(
+                timestamp__gte=since_24h
+            ).values('item_id').annotate(
+                total_quantity=Sum('quantity'),
+                total_value=Sum(F('quantity') * F('price'))
+            )
+        }
+
+        now_iso = timezone.now().isoformat()
         market_data = {}
-        
-        for item in items:
-            market_data[item.id] = self._get_item_market_data(item)
-        
+
+        for item_id, item_name in id_name_pairs:
+            best_bid = best_bids.get(item_id)
+            best_ask = best_asks.get(item_id)
+            last_price = last_prices.get(item_id)
+            volume = volumes_24h.get(item_id)
+
+            market_data[item_id] = {
+                'item_id': item_id,
+                'item_name': item_name,
+                'best_bid': float(best_bid) if best_bid is not None else None,
+                'best_ask': float(best_ask) if best_ask is not None else None,
+                'last_price': float(last_price) if last_price is not None else None,
+                'volume_24h': volume['total_quantity'] if volume else 0,
+                'value_24h': float(volume['total_value']) if volume else 0.0,
+                'spread': float(best_ask - best_bid) if (best_bid is not None and best_ask is not None) else None,
+                'updated_at': now_iso
+            }
+
         return market_data
     
     def _get_item_market_data(self, item: Item) -> Dict[str, Any]:
+        """
+        Récupère les données de marché d'un objet, via le cache.
+
+        La clé mkt:snap:{item_id} est invalidée par signal à chaque
+        écriture d'ordre ou de transaction, et explicitement après les
+        bulk_create du matching (qui court-circuitent post_save).
+
+        Args:
+            item: Objet concerné
+
+        Returns:
+            Dict avec les données de marché
+        """
+        cache_key = f'mkt:snap:{item.id}'
+        data = cache.get(cache_key)
+        if data is not None:
+            return data
+
+        data = self._compute_item_market_data(item)
+        cache.set(cache_key, data, settings.MARKET_DATA_CACHE_TTL)
+        return data
+
+    def _compute_item_market_data(self, item: Item) -> Dict[str, Any]:
         """
         Calcule les données de marché pour un objet spécifique.
-        
+
         Args:
             item: Objet concerné
-            
+
         Returns:
             Dict avec les données de marché
         """
-        # Meilleurs prix
-        best_bid = Order.objects.filter(
-            item=item,
-            order_type=OrderType.BUY,
-            status__in=[OrderStatus.PENDING, OrderStatus.PARTIAL]
-        ).order_by('-price').first()
-        
-        best_ask = Order.objects.filter(
-            item=item,
-            order_type=OrderType.SELL,
-            status__in=[OrderStatus.PENDING, OrderStatus.PARTIAL]
-        ).order_by('price').first()
-        
-        # Dernière transaction
-        last_transaction = Transaction.objects.filter(
-            item=item
-        ).order_by('-timestamp').first()
-        
-        # Volume 24h
-        from django.db.models import Sum, F
-        since_24h = timezone.now() - timezone.timedelta(hours=24)
-        volume_24h = Transaction.objects.filter(
-            item=item,
-            timestamp__gte=since_24h
-        ).aggregate(
-            total_quantity=Sum('quantity'),
-            total_value=Sum(F('quantity') * F('price'))
-        )
-        
+        # Meilleurs prix : O(1) depuis le carnet en mémoire s'il est
+        # chaud, sinon requêtes sur la colonne price uniquement
+        book = self._books.get(item.id)
+        if book is not None:
+            bid_ticks = book.best_bid()
+            ask_ticks = book.best_ask()
+        else:
+            bid = Order.objects.filter(
+                item=item,
+                order_type=OrderType.BUY,
+                status__in=ACTIVE_STATUSES
+            ).order_by('-price').values_list('price', flat=True).first()
+
+            ask = Order.objects.filter(
+                item=item,
+                order_type=OrderType.SELL,
+                status__in=ACTIVE_STATUSES
+            ).order_by('price').values_list('price', flat=True).first()
+
+            bid_ticks = int(bid * 100) if bid is not None else None
+            ask_ticks = int(ask * 100) if ask is not None else None
+
+        # Dernier prix d'exécution : mémoire d'abord, SQL à froid
+        last_price = self._last_trade.get(item.id)
+        if last_price is None:
+            last_price = Transaction.objects.filter(
+                item=item
+            ).order_by('-timestamp').values_list('price', flat=True).first()
+
+        # Volume 24h : fenêtre glissante incrémentale si le moteur l'a
+        # amorcée, sinon agrégat SQL (démarrage à froid)
+        window = self._vol24h.get(item.id)
+        if window is not None:
+            window.expire(time.time())
+            volume_24h = {
+                'total_quantity': window.quantity,
+                'total_value': window.value_ticks / 100.0
+            }
+        else:
+            since_24h = timezone.now() - timezone.timedelta(hours=24)
+            volume_24h = Transaction.objects.filter(
+                item=item,
+                timestamp__gte=since_24h
+            ).aggregate(
+                total_quantity=Sum('quantity'),
+                total_value=Sum(F('quantity') * F('price'))
+            )
+
         return {
             'item_id': item.id,
             'item_name': item.name,
-            'best_bid': float(best_bid.price) if best_bid else None,
-            'best_ask': float(best_ask.price) if best_ask else None,
-            'last_price': float(last_transaction.price) if last_transaction else None,
+            'best_bid': bid_ticks / 100.0 if bid_ticks is not None else None,
+            'best_ask': ask_ticks / 100.0 if ask_ticks is not None else None,
+            'last_price': float(last_price) if last_price is not None else None,
             'volume_24h': volume_24h['total_quantity'] or 0,
             'value_24h': float(volume_24h['total_value'] or 0),
-            'spread': float(best_ask.price - best_bid.price) if (best_bid and best_ask) else None,
+            'spread': (ask_ticks - bid_ticks) / 100.0 if (bid_ticks is not None and ask_ticks is not None) else None,
             'updated_at': timezone.now().isoformat()
         }
     
@@ -295,19 +732,31 @@ class MarketEngine:
             Liste des transactions créées
         """
         transactions = []
-        
-        # Récupération de tous les ordres actifs
+
+        # Mode 'scheduled' : on ne croise que les files de soumissions
+        # mises en attente depuis le dernier tick, drainées actif par
+        # actif — chaque croisement ne touche que le carnet de son objet
+        if self._pending_by_item:
+            with transaction.atomic():
+                for queue in self._pending_by_item.values():
+                    transactions.extend(self._drain_item_queue(queue))
+            self._pending_by_item.clear()
+            return transactions
+
+        # Mode 'immediate' : rematch global de sécurité depuis la base
         pending_orders = Order.objects.filter(
-            status__in=[OrderStatus.PENDING, OrderStatus.PARTIAL]
+            status__in=ACTIVE_STATUSES
         ).order_by('created_at')
-        
+
         for order in pending_orders:
             if order.is_active and order.remaining_quantity > 0:
-                matching_orders = self._find_matching_orders(order)
-                if matching_orders:
-                    new_transactions = self._execute_matches(order, matching_orders)
-                    transactions.extend(new_transactions)
-        
+                # Bloc atomique requis par select_for_update
+                with transaction.atomic():
+                    matching_orders = self._find_matching_orders(order)
+                    if matching_orders:
+                        new_transactions = self._execute_matches(order, matching_orders)
+                        transactions.extend(new_transactions)
+
         return transactions
     
     def cancel_order(self, order_id: int, agent_id: str) -> bool:
@@ -323,18 +772,49 @@ class MarketEngine:
         """
         try:
             order = Order.objects.get(id=order_id, agent_id=agent_id)
-            
-            if order.is_active:
-                order.status = OrderStatus.CANCELLED
-                order.save()
-                
-                # Suppression du carnet d'ordres
-                self._update_order_book(order)
-                
-                logger.info(f"Ordre annulé: {order}")
-                return True
-            
         except Order.DoesNotExist:
-            logger.warning(f"Tentative d'annulation d'un ordre inexistant: {order_id}")
-        
-        return False
\ No newline at end of file
+            logger.warning("Tentative d'annulation d'un ordre inexistant: %s", order_id)
+            return False
+
+        # UPDATE conditionnel : la condition de statut dans le WHERE évite
+        # la course lecture-modification-écriture avec un fill concurrent,
+        # et .update() saute save() et les signaux
+        updated = Order.objects.filter(
+            pk=order_id,
+            status__in=ACTIVE_STATUSES
+        ).update(status=OrderStatus.CANCELLED)
+
+        if updated:
+            order.status = OrderStatus.CANCELLED
+
+            # Suppression du carnet d'ordres
+            self._update_order_book(order)
+
+            # .update() ne déclenche pas post_save : invalidation explicite
+            cache.delete(f'mkt:snap:{order.item_id}')
+
+            logger.info("Ordre annulé: %s", order)
+            return True
+
+        return False
+
+# Moteur partagé du processus : conserve carnets, fenêtres de volume et
+# file de soumissions au chaud entre les requêtes
+_engine: Optional[MarketEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> MarketEngine:
+    """
+    Retourne le MarketEngine singleton du processus.
+
+    Les vues et le gestionnaire de simulation doivent passer par ici
+    plutôt que d'instancier MarketEngine par appel, ce qui jetterait
+    l'état en mémoire (carnets, fenêtres 24h) à chaque requête.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = MarketEngine()
+    return _engine
@@ -0,0 +1,134 @@
+# Generated by Django 5.2.17 on 2026-08-27 23:18
+
+import core.mixins
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Order',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Dernière modification')),
+                ('agent_id', models.CharField(help_text="Identifiant de l'agent qui place l'ordre", max_length=50, verbose_name='ID Agent')),
+                ('order_type', models.CharField(choices=[('BUY', 'Achat'), ('SELL', 'Vente')], max_length=4, verbose_name="Type d'ordre")),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.01'))], verbose_name='Prix unitaire')),
+                ('quantity', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)], verbose_name='Quantité')),
+                ('filled_quantity', models.PositiveIntegerField(default=0, verbose_name='Quantité exécutée')),
+                ('status', models.CharField(choices=[('PENDING', 'En attente'), ('PARTIAL', 'Partiellement exécuté'), ('FILLED', 'Complètement exécuté'), ('CANCELLED', 'Annulé'), ('EXPIRED', 'Expiré')], default='PENDING', max_length=10, verbose_name='État')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='orders', to='core.item', verbose_name='Objet')),
+            ],
+            options={
+                'verbose_name': 'Ordre',
+                'verbose_name_plural': 'Ordres',
+                'ordering': ['-created_at'],
+            },
+            bases=(core.mixins.SerializableMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='Transaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Dernière modification')),
+                ('buyer_id', models.CharField(max_length=50, verbose_name='ID Acheteur')),
+                ('seller_id', models.CharField(max_length=50, verbose_name='ID Vendeur')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.01'))], verbose_name="Prix d'exécution")),
+                ('quantity', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)], verbose_name='Quantité')),
+                ('timestamp', models.DateTimeField(auto_now_add=True, verbose_name="Heure d'exécution")),
+                ('buy_order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='buy_transactions', to='market.order', verbose_name="Ordre d'achat")),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to='core.item', verbose_name='Objet')),
+                ('sell_order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sell_transactions', to='market.order', verbose_name='Ordre de vente')),
+            ],
+            options={
+                'verbose_name': 'Transaction',
+                'verbose_name_plural': 'Transactions',
+                'ordering': ['-timestamp'],
+            },
+            bases=(core.mixins.SerializableMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='MarketSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Dernière modification')),
+                ('best_bid', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name="Meilleure offre d'achat")),
+                ('best_ask', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Meilleure offre de vente')),
+                ('last_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Dernier prix')),
+                ('volume_24h', models.PositiveIntegerField(default=0, verbose_name='Volume 24h')),
+                ('data', models.JSONField(blank=True, default=dict, verbose_name='Données additionnelles')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='market_snapshots', to='core.item', verbose_name='Objet')),
+            ],
+            options={
+                'verbose_name': 'Instantané de marché',
+                'verbose_name_plural': 'Instantanés de marché',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['item', 'created_at'], name='market_mark_item_id_4e43cf_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['item', 'order_type', 'status'], name='market_orde_item_id_f3d3d7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['item', '-created_at'], name='order_item_created_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['agent_id'], name='market_orde_agent_i_9f96ac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at'], name='market_orde_created_24e9d9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['price'], name='market_orde_price_1bccf8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__in', ['PENDING', 'PARTIAL'])), fields=['item', 'order_type', 'status', 'price', 'created_at'], name='ord_match_cov'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__in', ['PENDING', 'PARTIAL'])), fields=['item', 'order_type', 'status', '-price', 'created_at'], name='ord_match_cov_desc'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('filled_quantity__lt', models.F('quantity'))), fields=['item', 'order_type'], name='ord_active_depth'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['item', 'timestamp'], name='market_tran_item_id_50e1ea_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['item', '-timestamp'], name='tx_item_ts_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['buyer_id'], name='market_tran_buyer_i_35dc66_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['seller_id'], name='market_tran_seller__e5bbd4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['timestamp'], name='market_tran_timesta_5e4652_idx'),
+        ),
+    ]
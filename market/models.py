@@ -3,8 +3,12 @@ Modèles pour l'app market.
 Gestion des ordres, transactions et données de marché.
 """
 
+from datetime import timedelta
+
 from django.db import models
+from django.db.models import F, Sum
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from decimal import Decimal
 from core.models import Item
 from core.mixins import TimeStampedMixin, SerializableMixin
@@ -26,6 +30,12 @@ class OrderStatus(models.TextChoices):
     EXPIRED = 'EXPIRED', 'Expiré'
 
 
+# Statuts considérés actifs par le matching ; réutilisé par toutes les
+# requêtes plutôt que de reconstruire la liste à chaque appel
+ACTIVE_STATUSES = (OrderStatus.PENDING, OrderStatus.PARTIAL)
+_ACTIVE_STATUS_SET = frozenset(ACTIVE_STATUSES)
+
+
 class Order(TimeStampedMixin, SerializableMixin, models.Model):
     """
     Modèle représentant un ordre d'achat ou de vente.
@@ -89,9 +99,29 @@ class Order(TimeStampedMixin, SerializableMixin, models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['item', 'order_type', 'status']),
+            models.Index(fields=['item', '-created_at'], name='order_item_created_desc_idx'),
             models.Index(fields=['agent_id']),
             models.Index(fields=['created_at']),
             models.Index(fields=['price']),
+            # Index couvrants (filtre + tri du matching), restreints aux
+            # ordres actifs : le planner parcourt l'index déjà trié
+            models.Index(
+                fields=['item', 'order_type', 'status', 'price', 'created_at'],
+                name='ord_match_cov',
+                condition=models.Q(status__in=['PENDING', 'PARTIAL']),
+            ),
+            models.Index(
+                fields=['item', 'order_type', 'status', '-price', 'created_at'],
+                name='ord_match_cov_desc',
+                condition=models.Q(status__in=['PENDING', 'PARTIAL']),
+            ),
+            # Profondeur active exprimée en SQL (quantité non exécutée),
+            # sans dépendre du champ status dénormalisé
+            models.Index(
+                fields=['item', 'order_type'],
+                name='ord_active_depth',
+                condition=models.Q(filled_quantity__lt=F('quantity')),
+            ),
         ]
     
     def __str__(self) -> str:
@@ -105,7 +135,30 @@ class Order(TimeStampedMixin, SerializableMixin, models.Model):
     @property
     def is_active(self) -> bool:
         """Vérifie si l'ordre est encore actif."""
-        return self.status in [OrderStatus.PENDING, OrderStatus.PARTIAL]
+        return self.status in _ACTIVE_STATUS_SET
+
+    @property
+    def price_ticks(self) -> int:
+        """
+        Prix en ticks entiers (centimes).
+
+        Les comparaisons du chemin chaud de matching se font en int natif
+        plutôt qu'en Decimal ; la valeur est mémoïsée par instance.
+        """
+        ticks = self.__dict__.get('_price_ticks')
+        if ticks is None:
+            ticks = self.__dict__['_price_ticks'] = int(self.price * 100)
+        return ticks
+
+    @property
+    def side_sign(self) -> int:
+        """+1 pour un achat, -1 pour une vente (mémoïsé par instance)."""
+        sign = self.__dict__.get('_side_sign')
+        if sign is None:
+            sign = self.__dict__['_side_sign'] = (
+                1 if self.order_type == OrderType.BUY else -1
+            )
+        return sign
     
     @property
     def total_value(self) -> Decimal:
@@ -122,32 +175,26 @@ class Order(TimeStampedMixin, SerializableMixin, models.Model):
         Returns:
             True si les ordres peuvent être matchés
         """
-        if not (self.is_active and other_order.is_active):
-            return False
-        
-        if self.item_id != other_order.item_id:
-            return False
-        
-        if self.order_type == other_order.order_type:
-            return False
-        
-        if self.agent_id == other_order.agent_id:
-            return False
-        
-        # Vérification des prix compatibles
-        if self.order_type == OrderType.BUY:
-            return self.price >= other_order.price
-        else:
-            return self.price <= other_order.price
+        # Comparaisons int les moins chères d'abord ; le prix est vérifié
+        # sans branche sur le sens : (ticks_self - ticks_other) * signe >= 0
+        # couvre achat (>=) comme vente (<=)
+        return (
+            self.item_id == other_order.item_id
+            and self.order_type != other_order.order_type
+            and (self.price_ticks - other_order.price_ticks) * self.side_sign >= 0
+            and self.agent_id != other_order.agent_id
+            and self.is_active
+            and other_order.is_active
+        )
     
     def update_status(self) -> None:
         """Met à jour le statut de l'ordre selon la quantité exécutée."""
-        if self.filled_quantity == 0:
-            self.status = OrderStatus.PENDING
-        elif self.filled_quantity < self.quantity:
-            self.status = OrderStatus.PARTIAL
-        else:
-            self.status = OrderStatus.FILLED
+        filled = self.filled_quantity
+        self.status = (
+            OrderStatus.PENDING if filled == 0
+            else OrderStatus.PARTIAL if filled < self.quantity
+            else OrderStatus.FILLED
+        )
 
 
 class Transaction(TimeStampedMixin, SerializableMixin, models.Model):
@@ -220,6 +267,7 @@ class Transaction(TimeStampedMixin, SerializableMixin, models.Model):
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['item', 'timestamp']),
+            models.Index(fields=['item', '-timestamp'], name='tx_item_ts_desc_idx'),
             models.Index(fields=['buyer_id']),
             models.Index(fields=['seller_id']),
             models.Index(fields=['timestamp']),
@@ -233,6 +281,37 @@ class Transaction(TimeStampedMixin, SerializableMixin, models.Model):
         """Valeur totale de la transaction."""
         return self.price * self.quantity
 
+    @classmethod
+    def prune_older_than(cls, days: int = 30, batch_size: int = 10000) -> int:
+        """
+        Purge l'historique au-delà de la durée de rétention, par lots.
+
+        Borne la croissance de la table pour que les parcours historiques
+        (agrégats 24h à froid, exports) restent constants dans le temps.
+        À appeler depuis une tâche périodique.
+
+        Args:
+            days: Âge au-delà duquel les transactions sont supprimées
+            batch_size: Taille des lots de suppression
+
+        Returns:
+            Nombre total de transactions supprimées
+        """
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted_total = 0
+
+        while True:
+            pks = list(
+                cls.objects.filter(timestamp__lt=cutoff)
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            deleted, _ = cls.objects.filter(pk__in=pks).delete()
+            deleted_total += deleted
+
+        return deleted_total
+
 
 class MarketSnapshot(TimeStampedMixin, models.Model):
     """
@@ -299,3 +378,50 @@ class MarketSnapshot(TimeStampedMixin, models.Model):
     
     def __str__(self) -> str:
         return f"Marché {self.item.name} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+    @classmethod
+    def aggregate_bucket(cls, item: Item, window_minutes: int = 1,
+                         end=None) -> 'MarketSnapshot':
+        """
+        Construit un instantané agrégé sur une fenêtre temporelle.
+
+        Condense les transactions de la fenêtre en un seul enregistrement
+        avec prix moyen pondéré par quantité (P = Σ p·q / Σ q) et volume
+        cumulé, au lieu d'un instantané par tick.
+
+        Args:
+            item: Objet concerné
+            window_minutes: Largeur de la fenêtre d'agrégation
+            end: Borne supérieure de la fenêtre (défaut: maintenant)
+
+        Returns:
+            Instance non sauvegardée, à accumuler puis passer à bulk_create
+        """
+        end = end or timezone.now()
+        start = end - timedelta(minutes=window_minutes)
+
+        aggregates = Transaction.objects.filter(
+            item=item,
+            timestamp__gte=start,
+            timestamp__lt=end
+        ).aggregate(
+            total_value=Sum(F('price') * F('quantity')),
+            total_quantity=Sum('quantity')
+        )
+
+        quantity = aggregates['total_quantity'] or 0
+        weighted_price = None
+        if quantity:
+            weighted_price = (
+                Decimal(aggregates['total_value']) / quantity
+            ).quantize(Decimal('0.01'))
+
+        return cls(
+            item=item,
+            last_price=weighted_price,
+            volume_24h=quantity,
+            data={
+                'window_minutes': window_minutes,
+                'window_end': end.isoformat()
+            }
+        )
@@ -0,0 +1,36 @@
+"""
+Signaux pour l'app market.
+Invalidation du cache des données de marché.
+"""
+
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Order, Transaction
+
+
+@receiver(post_save, sender=Transaction, dispatch_uid='invalidate_market_data_cache')
+def invalidate_market_data_cache(sender, instance: Transaction, **kwargs) -> None:
+    """
+    Invalide les caches de marché de l'objet concerné par une transaction.
+
+    Les prix ne changent que lorsqu'une transaction est enregistrée ;
+    entre deux transactions, Item.get_market_data et l'instantané moteur
+    sont servis depuis le cache.
+    """
+    cache.delete_many([
+        f'market_data:{instance.item_id}',
+        f'mkt:snap:{instance.item_id}',
+    ])
+
+
+@receiver(post_save, sender=Order, dispatch_uid='invalidate_snapshot_cache')
+def invalidate_snapshot_cache(sender, instance: Order, **kwargs) -> None:
+    """
+    Invalide l'instantané de marché quand le carnet change.
+
+    Un ordre soumis, annulé ou (partiellement) exécuté déplace le
+    meilleur bid/ask même sans transaction.
+    """
+    cache.delete(f'mkt:snap:{instance.item_id}')
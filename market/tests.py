@@ -4,6 +4,7 @@ Tests pour l'app market.
 
 import pytest
 from decimal import Decimal
+from django.core.cache import cache
 from django.test import TestCase
 from django.core.exceptions import ValidationError
 
@@ -302,3 +303,142 @@ class MarketEngineTest(TestCase):
         # Tentative d'annulation par un autre agent
         result = self.engine.cancel_order(order.id, 'buyer_002')
         assert result is False
+
+
+class MarketEngineQueryCountTest(TestCase):
+    """
+    Tests verrouillant le nombre de requêtes des chemins chauds.
+
+    Une régression N+1 (perte d'un select_related, agrégat déplié en
+    boucle…) reste invisible des tests fonctionnels ; ces compteurs la
+    font échouer immédiatement.
+    """
+
+    def setUp(self):
+        """Initialisation des données de test."""
+        cache.clear()
+        self.engine = MarketEngine()
+        self.item = Item.objects.create(
+            name='Test Item',
+            category=ItemCategory.TRADING_CARDS,
+            total_supply=100
+        )
+
+    def test_submit_order_query_count(self):
+        """La soumission sans match garde un nombre fixe de requêtes."""
+        order = Order(
+            item=self.item,
+            agent_id='buyer_001',
+            order_type=OrderType.BUY,
+            price=Decimal('10.00'),
+            quantity=5
+        )
+
+        # Savepoint + insert + recherche de contreparties + hydratation
+        # du carnet + release
+        with self.assertNumQueries(5):
+            self.engine.submit_order(order)
+
+    def test_get_order_book_query_count(self):
+        """Le carnet coûte une hydratation, puis zéro requête."""
+        for i in range(25):
+            Order.objects.create(
+                item=self.item,
+                agent_id=f'buyer_{i:03d}',
+                order_type=OrderType.BUY,
+                price=Decimal('10.00') - i,
+                quantity=5
+            )
+            Order.objects.create(
+                item=self.item,
+                agent_id=f'seller_{i:03d}',
+                order_type=OrderType.SELL,
+                price=Decimal('11.00') + i,
+                quantity=3
+            )
+
+        # Première lecture : une seule requête d'hydratation du carnet
+        with self.assertNumQueries(1):
+            order_book = self.engine.get_order_book(self.item)
+
+        assert len(order_book['buy_orders']) == 25
+        assert len(order_book['sell_orders']) == 25
+
+        # Lectures suivantes servies depuis la mémoire
+        with self.assertNumQueries(0):
+            self.engine.get_order_book(self.item)
+
+    def test_get_market_snapshot_query_count(self):
+        """L'instantané d'un objet est borné puis servi par le cache."""
+        Order.objects.create(
+            item=self.item,
+            agent_id='buyer_001',
+            order_type=OrderType.BUY,
+            price=Decimal('9.50'),
+            quantity=5
+        )
+        Transaction.objects.create(
+            buyer_id='buyer_002',
+            seller_id='seller_002',
+            item=self.item,
+            price=Decimal('10.00'),
+            quantity=2
+        )
+
+        # Meilleur bid + meilleur ask + dernier prix + volume 24h
+        with self.assertNumQueries(4):
+            self.engine.get_market_snapshot(self.item)
+
+        # Deuxième lecture entièrement servie par le cache
+        with self.assertNumQueries(0):
+            self.engine.get_market_snapshot(self.item)
+
+    def test_full_snapshot_query_count(self):
+        """L'instantané global reste en requêtes constantes sur 50 objets."""
+        for i in range(50):
+            item = Item.objects.create(
+                name=f'Item {i:02d}',
+                category=ItemCategory.TRADING_CARDS,
+                total_supply=100
+            )
+            Order.objects.create(
+                item=item,
+                agent_id=f'seller_{i:03d}',
+                order_type=OrderType.SELL,
+                price=Decimal('11.00'),
+                quantity=3
+            )
+
+        # Liste des objets + bids + asks + derniers prix + volumes 24h
+        with self.assertNumQueries(5):
+            snapshots = self.engine.get_market_snapshot()
+
+        assert len(snapshots) == 51
+
+    def test_matching_query_uses_index(self):
+        """La recherche de contreparties passe par un index, pas un scan."""
+        from .models import ACTIVE_STATUSES
+
+        Order.objects.create(
+            item=self.item,
+            agent_id='buyer_001',
+            order_type=OrderType.BUY,
+            price=Decimal('10.00'),
+            quantity=5
+        )
+
+        plan = (
+            Order.objects.filter(
+                item=self.item,
+                order_type=OrderType.BUY,
+                status__in=ACTIVE_STATUSES,
+            )
+            .order_by('-price', 'created_at')
+            .explain()
+        )
+
+        # Le nom d'index retenu dépend du planner (SQLite préfère ici
+        # l'index composite complet aux index partiels) ; on verrouille
+        # l'essentiel : une recherche indexée, jamais de scan de table
+        assert 'USING INDEX' in plan, plan
+        assert 'SCAN market_order' not in plan, plan
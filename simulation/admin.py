@@ -1,3 +1,37 @@
+"""
+Interface d'administration pour l'app simulation.
+"""
+
 from django.contrib import admin
 
-# Register your models here.
+from .models import SimulationRun, SimulationMetric
+
+
+@admin.register(SimulationRun)
+class SimulationRunAdmin(admin.ModelAdmin):
+    """Administration des exécutions de simulation."""
+
+    list_display = [
+        'simulation_id', 'scenario', 'status', 'total_steps',
+        'total_agents', 'start_time', 'duration_seconds'
+    ]
+    list_filter = ['scenario', 'status', 'created_at']
+    search_fields = ['simulation_id', 'scenario']
+    ordering = ['-created_at']
+    readonly_fields = ['created_at', 'updated_at', 'duration_seconds']
+
+
+@admin.register(SimulationMetric)
+class SimulationMetricAdmin(admin.ModelAdmin):
+    """Administration des métriques de simulation."""
+
+    list_display = [
+        'id', 'simulation', 'step_number', 'orders_created',
+        'transactions_executed', 'total_volume', 'total_value'
+    ]
+    list_filter = ['simulation']
+    # Jointure de la simulation parente : __str__ et la colonne
+    # simulation n'émettent pas une requête FK par ligne listée
+    list_select_related = ('simulation',)
+    ordering = ['simulation', '-step_number']
+    readonly_fields = ['created_at', 'updated_at']
@@ -9,9 +9,11 @@ from typing import Dict, List, Optional, Any
 import logging
 
 from core.models import Item
-from core.utils import weighted_random_choice, calculate_price_bounds
+from core.utils import weighted_random_choice, calculate_price_bounds, cents_to_decimal
 from market.models import Order, OrderType
 from market.engine import MarketEngine
+from .context import SimulationContext, category_mask
+from .orders import CandidateOrder
 
 logger = logging.getLogger('simulation')
 
@@ -26,10 +28,18 @@ class Agent(ABC):
         inventory: Dictionnaire {item_id: quantité}
     """
     
+    # Dictionnaire d'instance supprimé : moins de mémoire par agent et
+    # accès aux attributs en slot direct.
+    __slots__ = (
+        'id', 'cash', 'inventory', 'order_history', 'active_orders',
+        '_risk_tolerance', '_patience', 'market_knowledge',
+        '_act_prob', '_risk_price_mul', 'act_fn',
+    )
+
     def __init__(self, agent_id: str, initial_cash: Decimal = Decimal('1000.00')):
         """
         Initialise un agent.
-        
+
         Args:
             agent_id: Identifiant unique
             initial_cash: Capital initial
@@ -39,26 +49,77 @@ class Agent(ABC):
         self.inventory: Dict[int, int] = {}
         self.order_history: List[Order] = []
         self.active_orders: List[int] = []  # IDs des ordres actifs
-        
-        # Paramètres de personnalité
+
+        # Paramètres de personnalité ; les setters dérivent les
+        # constantes du chemin chaud (_act_prob, _risk_price_mul) une
+        # fois par affectation plutôt qu'à chaque tick
+        self.market_knowledge = random.uniform(0.3, 0.9)
         self.risk_tolerance = random.uniform(0.1, 0.9)
         self.patience = random.uniform(0.2, 0.8)
-        self.market_knowledge = random.uniform(0.3, 0.9)
+
+        # Méthode act pré-liée : le dispatch du tick lit un slot au lieu
+        # de reconstruire une méthode liée par appel
+        self.act_fn = self.act
+
+    # Amplitude de l'ajustement de prix lié au risque (±10% par défaut)
+    RISK_PRICE_RANGE = 0.2
+
+    @property
+    def patience(self) -> float:
+        return self._patience
+
+    @patience.setter
+    def patience(self, value: float) -> None:
+        self._patience = value
+        self._act_prob = self._base_act_prob()
+
+    @property
+    def risk_tolerance(self) -> float:
+        return self._risk_tolerance
+
+    @risk_tolerance.setter
+    def risk_tolerance(self, value: float) -> None:
+        self._risk_tolerance = value
+        self._risk_price_mul = 1 + (value - 0.5) * self.RISK_PRICE_RANGE
+
+    def _base_act_prob(self) -> float:
+        """Probabilité d'agir à chaque tick (dérivée de la patience)."""
+        return 0.1 + (self.patience * 0.3)
     
     @abstractmethod
-    def act(self, market: MarketEngine, step: int) -> Optional[Order]:
+    def act(self, market: MarketEngine, step: int,
+            ctx: Optional[SimulationContext] = None) -> Optional[CandidateOrder]:
         """
         Action de l'agent à chaque étape de simulation.
-        
+
         Args:
             market: Moteur de marché
             step: Numéro de l'étape courante
-            
+            ctx: Contexte partagé de l'étape (caches de requêtes)
+
         Returns:
             Ordre créé ou None
         """
         pass
     
+    def reset(self, agent_id: str, initial_cash: Decimal) -> None:
+        """
+        Réinitialise l'agent pour une réutilisation (voir simulation.pool).
+
+        L'identité, la trésorerie et les collections d'état repartent de
+        zéro ; les traits de personnalité tirés à la construction sont
+        conservés.
+
+        Args:
+            agent_id: Nouvel identifiant
+            initial_cash: Nouveau capital initial
+        """
+        self.id = agent_id
+        self.cash = initial_cash
+        self.inventory.clear()
+        self.order_history.clear()
+        self.active_orders.clear()
+
     def get_item_quantity(self, item_id: int) -> int:
         """Récupère la quantité d'un objet dans l'inventaire."""
         return self.inventory.get(item_id, 0)
@@ -87,6 +148,21 @@ class Agent(ABC):
         """Vérifie si l'agent peut se permettre un achat."""
         return self.cash >= (price * quantity)
     
+    def apply_inventory_delta(self, deltas: Dict[int, int]) -> None:
+        """
+        Applique un lot de variations nettes d'inventaire.
+
+        Args:
+            deltas: item_id -> variation nette (positive ou négative)
+        """
+        inventory = self.inventory
+        for item_id, delta in deltas.items():
+            new_quantity = inventory.get(item_id, 0) + delta
+            if new_quantity > 0:
+                inventory[item_id] = new_quantity
+            else:
+                inventory.pop(item_id, None)
+
     def update_cash(self, amount: Decimal) -> None:
         """Met à jour le montant d'argent."""
         self.cash += amount
@@ -102,27 +178,36 @@ class Agent(ABC):
             Valeur totale (cash + inventaire)
         """
         total_value = self.cash
-        
+
+        if not self.inventory:
+            return total_value
+
+        # Instantanés récupérés en une fois pour tout l'inventaire ;
+        # seuls id et name sont consommés, inutile de charger le reste
+        snapshots = market.get_market_snapshots(
+            Item.objects.filter(id__in=self.inventory).only('id', 'name')
+        )
+
+        # Somme accumulée en float (produit scalaire prix·quantités),
+        # une seule conversion Decimal à la fin au lieu d'une par objet
+        inventory_value = 0.0
+
         for item_id, quantity in self.inventory.items():
-            try:
-                item = Item.objects.get(id=item_id)
-                market_data = market.get_market_snapshot(item)
-                
-                # Utilise le dernier prix ou le prix moyen bid/ask
-                if market_data['last_price']:
-                    price = Decimal(str(market_data['last_price']))
-                elif market_data['best_bid'] and market_data['best_ask']:
-                    price = (Decimal(str(market_data['best_bid'])) + 
-                            Decimal(str(market_data['best_ask']))) / 2
-                else:
-                    price = Decimal('10.00')  # Prix par défaut
-                
-                total_value += price * quantity
-                
-            except Item.DoesNotExist:
+            market_data = snapshots.get(item_id)
+            if market_data is None:
                 continue
-        
-        return total_value
+
+            # Utilise le dernier prix ou le prix moyen bid/ask
+            if market_data['last_price']:
+                price_f = market_data['last_price']
+            elif market_data['best_bid'] and market_data['best_ask']:
+                price_f = (market_data['best_bid'] + market_data['best_ask']) / 2
+            else:
+                price_f = 10.0  # Prix par défaut
+
+            inventory_value += price_f * quantity
+
+        return total_value + cents_to_decimal(int(round(inventory_value * 100)))
     
     def to_dict(self) -> Dict[str, Any]:
         """Sérialise l'agent en dictionnaire."""
@@ -142,93 +227,93 @@ class Buyer(Agent):
     """
     Agent acheteur avec stratégies d'achat.
     """
-    
+
+    __slots__ = ('preferred_categories', 'category_mask', 'budget_per_item')
+
     def __init__(self, agent_id: str, initial_cash: Decimal = Decimal('1000.00')):
         super().__init__(agent_id, initial_cash)
         self.preferred_categories = random.sample(
-            ['cards', 'figurines', 'comics', 'toys', 'art'], 
+            ['cards', 'figurines', 'comics', 'toys', 'art'],
             k=random.randint(1, 3)
         )
+        # Masque de bits dérivé, pour la sélection sans chaînes
+        self.category_mask = category_mask(self.preferred_categories)
+        self.budget_per_item = self.cash * Decimal(str(random.uniform(0.05, 0.2)))
+
+    def reset(self, agent_id: str, initial_cash: Decimal) -> None:
+        """Réinitialise l'acheteur (budget retiré du nouveau capital)."""
+        super().reset(agent_id, initial_cash)
         self.budget_per_item = self.cash * Decimal(str(random.uniform(0.05, 0.2)))
     
-    def act(self, market: MarketEngine, step: int) -> Optional[Order]:
+    def act(self, market: MarketEngine, step: int,
+            ctx: Optional[SimulationContext] = None) -> Optional[CandidateOrder]:
         """
         Stratégie d'achat de l'agent.
-        
+
         Args:
             market: Moteur de marché
             step: Étape de simulation
-            
+            ctx: Contexte partagé de l'étape (caches de requêtes)
+
         Returns:
             Ordre d'achat ou None
         """
-        # Probabilité de placer un ordre (dépend de la patience)
-        if random.random() > 0.1 + (self.patience * 0.3):
+        # Sélection d'un objet à acheter ; via le contexte partagé, les
+        # listes par catégories ne sont matérialisées qu'une fois par tick
+        if ctx is None:
+            ctx = SimulationContext()
+
+        # Probabilité de placer un ordre (dépend de la patience) ;
+        # tirage servi depuis le réservoir par lots du contexte
+        if ctx.next_uniform() > self._act_prob:
             return None
-        
-        # Sélection d'un objet à acheter
-        available_items = Item.objects.filter(
-            category__in=self.preferred_categories
-        )
-        
-        if not available_items.exists():
-            available_items = Item.objects.all()
-        
-        if not available_items.exists():
+
+        available_items = ctx.items_for_mask(self.category_mask)
+
+        if not available_items:
+            available_items = ctx.all_items()
+
+        if not available_items:
             return None
-        
-        item = self.buying_strategy(market, available_items, step)
-        
+
+        item = self.buying_strategy(market, available_items, step, ctx)
+
         if item:
             return self._create_buy_order(item, market)
-        
+
         return None
-    
-    def buying_strategy(self, market: MarketEngine, items: List[Item], step: int) -> Optional[Item]:
+
+    def buying_strategy(self, market: MarketEngine, items: List[Item], step: int,
+                        ctx: Optional[SimulationContext] = None) -> Optional[Item]:
         """
         Stratégie de sélection d'objet à acheter.
-        
+
         Args:
             market: Moteur de marché
             items: Objets disponibles
             step: Étape courante
-            
+            ctx: Contexte partagé de l'étape (caches de scores)
+
         Returns:
             Objet sélectionné ou None
         """
-        # Évalue chaque objet selon différents critères
-        item_scores = []
-        
-        for item in items:
-            market_data = market.get_market_snapshot(item)
-            
-            # Critères d'évaluation
-            liquidity_score = min(market_data.get('volume_24h', 0) / 10, 1.0)
-            
-            # Prix attractif (spread faible = bon)
-            spread = market_data.get('spread')
-            spread_score = 1.0 - min(spread / 10 if spread else 0, 1.0)
-            
-            # Tendance de prix (préfère les objets en hausse)
-            trend_score = 0.8 if item.get_market_data().get('price_trend') == 'up' else 0.5
-            
-            # Score combiné
-            total_score = (
-                liquidity_score * 0.3 +
-                spread_score * 0.4 +
-                trend_score * 0.3
-            ) * self.market_knowledge
-            
-            if total_score > 0.1:
-                item_scores.append((item, total_score))
-        
-        # Sélection pondérée
-        if item_scores:
-            return weighted_random_choice(item_scores)
-        
-        return random.choice(list(items)) if items else None
+        if ctx is None:
+            ctx = SimulationContext()
+        if not isinstance(items, list):
+            items = list(items)
+
+        # Sélection pondérée via l'échantillonneur partagé du tick :
+        # multiplier tous les scores par market_knowledge ne change pas
+        # la distribution, seulement le seuil d'inclusion (0.1 sur le
+        # score pondéré, soit 0.1/knowledge sur le score de base)
+        sampler = ctx.buy_sampler(market, items, 0.1 / self.market_knowledge)
+        item = sampler.sample()
+        if item is not None:
+            return item
+
+        return random.choice(items) if items else None
     
-    def _create_buy_order(self, item: Item, market: MarketEngine) -> Optional[Order]:
+    def _create_buy_order(self, item: Item, market: MarketEngine) -> Optional[CandidateOrder]:
         """
         Crée un ordre d'achat pour un objet.
         
@@ -240,43 +325,52 @@ class Buyer(Agent):
             Ordre créé ou None
         """
         market_data = market.get_market_snapshot(item)
-        
-        # Détermination du prix d'offre
+
+        # Détermination du prix d'offre : calcul en float (l'instantané
+        # est déjà en float), Decimal uniquement à la création de l'ordre
         if market_data['best_ask']:
-            base_price = Decimal(str(market_data['best_ask']))
             # Offre légèrement en dessous du meilleur ask
-            price = base_price * Decimal(str(random.uniform(0.95, 0.99)))
+            price_f = market_data['best_ask'] * random.uniform(0.95, 0.99)
         elif market_data['last_price']:
-            base_price = Decimal(str(market_data['last_price']))
-            price = base_price * Decimal(str(random.uniform(0.9, 1.1)))
+            price_f = market_data['last_price'] * random.uniform(0.9, 1.1)
         else:
             # Prix par défaut basé sur la catégorie
-            price = Decimal(str(random.uniform(5.0, 50.0)))
-        
-        # Ajustement selon la tolérance au risque
-        price *= Decimal(str(1 + (self.risk_tolerance - 0.5) * 0.2))
-        
+            price_f = random.uniform(5.0, 50.0)
+
+        # Ajustement selon la tolérance au risque (précalculé)
+        price_f *= self._risk_price_mul
+
+        if price_f <= 0:
+            return None
+
         # Quantité basée sur le budget
-        max_quantity = int(self.budget_per_item / price) if price > 0 else 1
+        max_quantity = int(float(self.budget_per_item) / price_f)
         quantity = random.randint(1, max(1, max_quantity))
-        
+
+        # Conversion au format monétaire à la frontière de l'ordre :
+        # arrondi entier en centimes puis scaleb, sans passage par une
+        # chaîne formatée
+        price = cents_to_decimal(int(round(price_f * 100)))
+
         # Vérification de la capacité d'achat
         if not self.can_afford(price, quantity):
             # Ajustement de la quantité
             quantity = int(self.cash / price) if price > 0 else 0
-        
+
         if quantity > 0 and price > 0:
-            order = Order(
+            # Dataclass léger : le modèle Order n'est construit qu'à la
+            # persistance
+            order = CandidateOrder(
                 item=item,
                 agent_id=self.id,
                 order_type=OrderType.BUY,
-                price=price.quantize(Decimal('0.01')),
+                price=price,
                 quantity=quantity
             )
-            
+
             logger.debug(f"Agent {self.id} crée ordre d'achat: {quantity}x {item.name} @ {price}€")
             return order
-        
+
         return None
 
 
@@ -284,105 +378,160 @@ class Seller(Agent):
     """
     Agent vendeur avec stratégies de vente.
     """
-    
+
+    __slots__ = ('_profit_target', '_profit_target_f')
+
     def __init__(self, agent_id: str, initial_cash: Decimal = Decimal('500.00')):
         super().__init__(agent_id, initial_cash)
         # Les vendeurs commencent avec des objets dans leur inventaire
         self._initialize_inventory()
         self.profit_target = Decimal(str(random.uniform(1.1, 1.5)))  # 10-50% de profit
+
+    def reset(self, agent_id: str, initial_cash: Decimal) -> None:
+        """Réinitialise le vendeur (inventaire de départ resemé)."""
+        super().reset(agent_id, initial_cash)
+        self._initialize_inventory()
+
+    @property
+    def profit_target(self) -> Decimal:
+        return self._profit_target
+
+    @profit_target.setter
+    def profit_target(self, value: Decimal) -> None:
+        # Miroir float tenu en phase (les scénarios réaffectent la cible)
+        self._profit_target = value
+        self._profit_target_f = float(value)
+
+    # Les vendeurs ajustent moins fortement leurs prix (±5%)
+    RISK_PRICE_RANGE = 0.1
+
+    def _base_act_prob(self) -> float:
+        return 0.15 + (self.patience * 0.2)
     
+    # Identifiants d'objets servant d'inventaire de départ, partagés
+    # par tous les vendeurs du processus (une requête au lieu d'une par
+    # vendeur construit)
+    _seed_item_ids: Optional[List[int]] = None
+
+    @classmethod
+    def _get_seed_item_ids(cls) -> List[int]:
+        """Identifiants des objets de départ (mémoïsés par classe)."""
+        if not cls._seed_item_ids:
+            # Limite aux 10 premiers objets ; une liste vide n'est pas
+            # mémoïsée (les objets peuvent ne pas encore exister)
+            cls._seed_item_ids = list(
+                Item.objects.values_list('id', flat=True)[:10]
+            )
+        return cls._seed_item_ids
+
     def _initialize_inventory(self) -> None:
         """Initialise l'inventaire du vendeur avec des objets aléatoires."""
-        items = list(Item.objects.all()[:10])  # Limite aux 10 premiers objets
-        
+        item_ids = self._get_seed_item_ids()
+
         for _ in range(random.randint(3, 8)):
-            if items:
-                item = random.choice(items)
+            if item_ids:
                 quantity = random.randint(1, 5)
-                self.add_item(item.id, quantity)
+                self.add_item(random.choice(item_ids), quantity)
     
-    def act(self, market: MarketEngine, step: int) -> Optional[Order]:
+    def act(self, market: MarketEngine, step: int,
+            ctx: Optional[SimulationContext] = None) -> Optional[CandidateOrder]:
         """
         Stratégie de vente de l'agent.
-        
+
         Args:
             market: Moteur de marché
             step: Étape de simulation
-            
+            ctx: Contexte partagé de l'étape (réservoir de tirages)
+
         Returns:
             Ordre de vente ou None
         """
-        # Probabilité de placer un ordre
-        if random.random() > 0.15 + (self.patience * 0.2):
+        # Probabilité de placer un ordre ; tirage servi depuis le
+        # réservoir par lots du contexte
+        if ctx is None:
+            ctx = SimulationContext()
+
+        if ctx.next_uniform() > self._act_prob:
             return None
-        
+
         # Sélection d'un objet à vendre
         if not self.inventory:
             return None
         
-        item_id = self.selling_strategy(market, step)
-        
-        if item_id:
-            try:
-                item = Item.objects.get(id=item_id)
-                return self._create_sell_order(item, market)
-            except Item.DoesNotExist:
-                pass
-        
+        item = self.selling_strategy(market, step, ctx)
+
+        if item is not None:
+            return self._create_sell_order(item, market)
+
         return None
-    
-    def selling_strategy(self, market: MarketEngine, step: int) -> Optional[int]:
+
+    def selling_strategy(self, market: MarketEngine, step: int,
+                         ctx: Optional[SimulationContext] = None) -> Optional[Item]:
         """
         Stratégie de sélection d'objet à vendre.
-        
+
         Args:
             market: Moteur de marché
             step: Étape courante
-            
+            ctx: Contexte partagé de l'étape (index id -> objet)
+
         Returns:
-            ID de l'objet sélectionné ou None
+            Objet sélectionné ou None
         """
         if not self.inventory:
             return None
-        
-        # Évalue chaque objet en inventaire
+
+        # Index id -> objet partagé du tick quand il est disponible
+        # (zéro requête par vendeur) ; sinon une seule requête pour tout
+        # l'inventaire, restreinte aux colonnes utilisées
+        if ctx is not None:
+            shared_index = ctx.items_by_id()
+            items_by_id = {
+                item_id: shared_index[item_id]
+                for item_id in self.inventory
+                if item_id in shared_index
+            }
+        else:
+            items_by_id = Item.objects.only('id', 'name').in_bulk(
+                self.inventory.keys()
+            )
+
+        # Instantanés récupérés en une fois pour tout l'inventaire
+        snapshots = market.get_market_snapshots(items_by_id.values())
         item_scores = []
-        
+
         for item_id, quantity in self.inventory.items():
-            try:
-                item = Item.objects.get(id=item_id)
-                market_data = market.get_market_snapshot(item)
-                
-                # Critères d'évaluation pour la vente
-                demand_score = min(market_data.get('volume_24h', 0) / 5, 1.0)
-                
-                # Prix favorable (prix élevé = bon pour vendre)
-                price_score = 0.5
-                if market_data.get('best_bid'):
-                    price_score = min(market_data['best_bid'] / 100, 1.0)
-                
-                # Urgence (plus l'inventaire est important, plus urgent de vendre)
-                urgency_score = min(quantity / 10, 1.0)
-                
-                total_score = (
-                    demand_score * 0.4 +
-                    price_score * 0.4 +
-                    urgency_score * 0.2
-                ) * self.market_knowledge
-                
-                if total_score > 0.1:
-                    item_scores.append((item_id, total_score))
-                    
-            except Item.DoesNotExist:
+            market_data = snapshots.get(item_id)
+            if market_data is None:
                 continue
-        
+
+            # Critères d'évaluation pour la vente
+            demand_score = min(market_data.get('volume_24h', 0) / 5, 1.0)
+
+            # Prix favorable (prix élevé = bon pour vendre)
+            price_score = 0.5
+            if market_data.get('best_bid'):
+                price_score = min(market_data['best_bid'] / 100, 1.0)
+
+            # Urgence (plus l'inventaire est important, plus urgent de vendre)
+            urgency_score = min(quantity / 10, 1.0)
+
+            total_score = (
+                demand_score * 0.4 +
+                price_score * 0.4 +
+                urgency_score * 0.2
+            ) * self.market_knowledge
+
+            if total_score > 0.1:
+                item_scores.append((item_id, total_score))
+
         # Sélection pondérée
         if item_scores:
-            return weighted_random_choice(item_scores)
-        
-        return random.choice(list(self.inventory.keys()))
+            return items_by_id.get(weighted_random_choice(item_scores))
+
+        return items_by_id.get(random.choice(list(self.inventory.keys())))
     
-    def _create_sell_order(self, item: Item, market: MarketEngine) -> Optional[Order]:
+    def _create_sell_order(self, item: Item, market: MarketEngine) -> Optional[CandidateOrder]:
         """
         Crée un ordre de vente pour un objet.
         
@@ -399,36 +548,39 @@ class Seller(Agent):
             return None
         
         market_data = market.get_market_snapshot(item)
-        
-        # Détermination du prix de vente
+
+        # Détermination du prix de vente : calcul en float, Decimal
+        # uniquement à la création de l'ordre
         if market_data['best_bid']:
-            base_price = Decimal(str(market_data['best_bid']))
             # Prix légèrement au-dessus du meilleur bid
-            price = base_price * Decimal(str(random.uniform(1.01, 1.05)))
+            price_f = market_data['best_bid'] * random.uniform(1.01, 1.05)
         elif market_data['last_price']:
-            base_price = Decimal(str(market_data['last_price']))
-            price = base_price * self.profit_target
+            price_f = market_data['last_price'] * self._profit_target_f
         else:
             # Prix par défaut
-            price = Decimal(str(random.uniform(10.0, 100.0)))
-        
-        # Ajustement selon la tolérance au risque
-        price *= Decimal(str(1 + (self.risk_tolerance - 0.5) * 0.1))
-        
+            price_f = random.uniform(10.0, 100.0)
+
+        # Ajustement selon la tolérance au risque (précalculé)
+        price_f *= self._risk_price_mul
+
         # Quantité à vendre (entre 1 et disponible)
         max_sell = min(available_quantity, random.randint(1, 3))
         quantity = random.randint(1, max_sell)
-        
+
+        price = cents_to_decimal(int(round(price_f * 100)))
+
         if quantity > 0 and price > 0:
-            order = Order(
+            # Dataclass léger : le modèle Order n'est construit qu'à la
+            # persistance
+            order = CandidateOrder(
                 item=item,
                 agent_id=self.id,
                 order_type=OrderType.SELL,
-                price=price.quantize(Decimal('0.01')),
+                price=price,
                 quantity=quantity
             )
-            
+
             logger.debug(f"Agent {self.id} crée ordre de vente: {quantity}x {item.name} @ {price}€")
             return order
-        
+
         return None
\ No newline at end of file
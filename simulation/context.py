@@ -0,0 +1,253 @@
+"""
+Contexte partagé d'une étape de simulation.
+"""
+
+import random
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from core.models import Item, ItemCategory
+from core.utils import WeightedSampler
+from market.models import Transaction
+
+# Bit attribué à chaque catégorie : les préférences d'un agent tiennent
+# dans un masque d'entier et l'appartenance devient un ET binaire
+CATEGORY_BITS: Dict[str, int] = {
+    category: 1 << index
+    for index, category in enumerate(ItemCategory.values)
+}
+
+
+def category_mask(categories) -> int:
+    """Encode un ensemble de catégories en masque de bits."""
+    mask = 0
+    for category in categories:
+        mask |= CATEGORY_BITS.get(category, 0)
+    return mask
+
+
+class SimulationContext:
+    """
+    Caches de requêtes partagés entre les agents pendant une étape.
+
+    Des milliers d'agents répètent les mêmes lectures à chaque tick
+    (listes d'objets par catégories préférées) ; le contexte ne les
+    exécute qu'une fois et sert les suivantes depuis la mémoire. Le
+    gestionnaire crée un contexte neuf par étape, ce qui tient lieu
+    d'invalidation.
+    """
+
+    def __init__(self):
+        self._items_by_bit: Optional[Dict[int, List[Item]]] = None
+        self._items_by_mask: Dict[int, List[Item]] = {}
+        self._all_items: Optional[List[Item]] = None
+        self._items_by_id: Optional[Dict[int, Item]] = None
+        self._buy_scores: Dict[Tuple[int, ...], List[Tuple[Item, float]]] = {}
+        self._buy_samplers: Dict[Tuple[int, ...], tuple] = {}
+        self._price_trends: Dict[Tuple[int, ...], Dict[int, str]] = {}
+        self._uniform_pool: List[float] = []
+
+    # Taille de remplissage du réservoir de tirages uniformes
+    _POOL_SIZE = 1024
+
+    def next_uniform(self) -> float:
+        """
+        Tirage uniforme [0, 1) servi depuis un réservoir pré-rempli.
+
+        Le générateur est sollicité par lots plutôt qu'à chaque agent :
+        une seule résolution d'attribut et un seul appel de remplissage
+        pour ~mille tirages, au lieu d'un dispatch Python par tirage.
+        """
+        pool = self._uniform_pool
+        if not pool:
+            rnd = random.random
+            pool.extend(rnd() for _ in range(self._POOL_SIZE))
+        return pool.pop()
+
+    def items_for_mask(self, mask: int) -> List[Item]:
+        """
+        Liste des objets dont la catégorie appartient au masque.
+
+        Les objets sont partitionnés par bit de catégorie une fois par
+        étape (une seule requête) ; la sélection par agent n'est plus
+        qu'un ET binaire sur des listes en mémoire, sans SQL ni hachage
+        de chaînes.
+
+        Args:
+            mask: Masque de bits de catégories (voir category_mask)
+
+        Returns:
+            Objets correspondants, matérialisés une seule fois par étape
+        """
+        items = self._items_by_mask.get(mask)
+        if items is not None:
+            return items
+
+        if self._items_by_bit is None:
+            per_bit: Dict[int, List[Item]] = {}
+            for item in self.all_items():
+                per_bit.setdefault(
+                    CATEGORY_BITS.get(item.category, 0), []
+                ).append(item)
+            self._items_by_bit = per_bit
+
+        items = []
+        for bit, bit_items in self._items_by_bit.items():
+            if bit & mask:
+                items.extend(bit_items)
+
+        self._items_by_mask[mask] = items
+        return items
+
+    def all_items(self) -> List[Item]:
+        """Liste de tous les objets (mémoïsée)."""
+        if self._all_items is None:
+            self._all_items = list(Item.objects.all())
+        return self._all_items
+
+    def items_by_id(self) -> Dict[int, Item]:
+        """
+        Index id -> objet, partagé par tous les agents du tick.
+
+        Remplace les in_bulk par agent (valorisation d'inventaire,
+        sélection de vente) par un accès dict sur la liste déjà
+        matérialisée.
+        """
+        if self._items_by_id is None:
+            self._items_by_id = {item.id: item for item in self.all_items()}
+        return self._items_by_id
+
+    def price_trends(self, items: List[Item]) -> Dict[int, str]:
+        """
+        Tendances de prix par objet (mémoïsées pour l'étape).
+
+        La tendance est une propriété du marché, pas de l'agent :
+        inutile de la recalculer par acheteur. Les six derniers prix de
+        chaque objet sont récupérés en une seule requête à fonction de
+        fenêtre (numérotation par objet, ordre anté-chronologique), puis
+        passés au calcul de tendance existant d'Item.
+
+        Args:
+            items: Objets concernés
+
+        Returns:
+            Dict item_id -> 'up' / 'down' / 'stable'
+        """
+        key = tuple(item.id for item in items)
+        trends = self._price_trends.get(key)
+        if trends is not None:
+            return trends
+
+        prices_by_item: Dict[int, list] = {}
+        rows = (
+            Transaction.objects.filter(item_id__in=key)
+            .annotate(rn=Window(
+                RowNumber(),
+                partition_by=F('item_id'),
+                order_by=F('timestamp').desc(),
+            ))
+            .filter(rn__lte=6)
+            .order_by('item_id', 'rn')
+            .values_list('item_id', 'price')
+        )
+        for item_id, price in rows:
+            prices_by_item.setdefault(item_id, []).append(price)
+
+        trends = {
+            item.id: item._calculate_trend(prices_by_item.get(item.id, []))
+            for item in items
+        }
+        self._price_trends[key] = trends
+        return trends
+
+    def buy_scores(self, market, items: List[Item]) -> List[Tuple[Item, float]]:
+        """
+        Scores d'achat de base par objet (mémoïsés pour l'étape).
+
+        Les composantes liquidité/spread/tendance du score sont
+        identiques pour tous les acheteurs : elles sont calculées une
+        fois par tick et par ensemble d'objets. La pondération propre à
+        l'agent (market_knowledge) reste un simple produit scalaire côté
+        appelant.
+
+        Args:
+            market: Moteur de marché
+            items: Objets candidats
+
+        Returns:
+            Liste de paires (objet, score de base)
+        """
+        key = tuple(item.id for item in items)
+        scores = self._buy_scores.get(key)
+        if scores is not None:
+            return scores
+
+        snapshots = market.get_market_snapshots(items)
+        trends = self.price_trends(items)
+        scores = []
+
+        for item in items:
+            market_data = snapshots.get(item.id, {})
+
+            # Liquidité (volume échangé)
+            liquidity_score = min(market_data.get('volume_24h', 0) / 10, 1.0)
+
+            # Prix attractif (spread faible = bon)
+            spread = market_data.get('spread')
+            spread_score = 1.0 - min(spread / 10 if spread else 0, 1.0)
+
+            # Tendance de prix (préfère les objets en hausse)
+            trend_score = 0.8 if trends.get(item.id) == 'up' else 0.5
+
+            scores.append((
+                item,
+                liquidity_score * 0.3 + spread_score * 0.4 + trend_score * 0.3
+            ))
+
+        self._buy_scores[key] = scores
+        return scores
+
+    def buy_sampler(self, market, items: List[Item],
+                    min_base_score: float) -> WeightedSampler:
+        """
+        Échantillonneur pondéré partagé pour la sélection d'achat.
+
+        La pondération market_knowledge d'un agent multiplie tous les
+        scores par la même constante : elle ne change pas la
+        distribution de tirage, seulement le seuil d'inclusion. Les
+        scores de base sont donc triés une fois par tick ; pour un seuil
+        donné, le nombre d'objets retenus se résout par recherche
+        binaire et la CDF correspondante n'est construite qu'une fois
+        par préfixe distinct, puis partagée entre tous les acheteurs.
+
+        Args:
+            market: Moteur de marché
+            items: Objets candidats
+            min_base_score: Seuil strict sur le score de base
+
+        Returns:
+            Échantillonneur sur les objets dont le score dépasse le
+            seuil (vide si aucun ne le dépasse)
+        """
+        key = tuple(item.id for item in items)
+        entry = self._buy_samplers.get(key)
+        if entry is None:
+            ranked = sorted(
+                self.buy_scores(market, items),
+                key=lambda pair: pair[1],
+                reverse=True,
+            )
+            # Scores négés croissants, pour bisect
+            neg_scores = [-score for _, score in ranked]
+            entry = self._buy_samplers[key] = (ranked, neg_scores, {})
+
+        ranked, neg_scores, samplers = entry
+        count = bisect_left(neg_scores, -min_base_score)
+
+        sampler = samplers.get(count)
+        if sampler is None:
+            sampler = samplers[count] = WeightedSampler(ranked[:count])
+        return sampler
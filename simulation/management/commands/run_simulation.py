@@ -6,6 +6,7 @@ Usage:
     python manage.py run_simulation --scenario=demand_x2 --steps=200 --agents=100 --seed=12345
 """
 
+import json
 import random
 from decimal import Decimal
 from datetime import datetime
@@ -13,9 +14,10 @@ from typing import Optional
 
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
-from django.db import transaction
+from django.db import connection, transaction
 
 from core.models import Item
+from core.utils import JSONEncoder
 from simulation.manager import SimulationManager
 from simulation.scenarios import AVAILABLE_SCENARIOS, create_scenario
 from simulation.models import SimulationRun, SimulationMetric
@@ -105,6 +107,7 @@ class Command(BaseCommand):
     
     def handle(self, *args, **options):
         """Exécute la commande."""
+        simulation_run = None
         try:
             # Configuration de la graine aléatoire
             if options['seed']:
@@ -139,7 +142,6 @@ class Command(BaseCommand):
             self._display_config(options, n_buyers, n_sellers)
             
             # Création du SimulationRun si sauvegarde activée
-            simulation_run = None
             if not options['no_save']:
                 simulation_run = self._create_simulation_run(options, n_buyers, n_sellers)
             
@@ -182,16 +184,38 @@ class Command(BaseCommand):
             )
             
         except KeyboardInterrupt:
+            self._mark_run_status(simulation_run, 'cancelled')
             self.stdout.write(
                 self.style.ERROR("Simulation interrompue par l'utilisateur")
             )
             return
-            
+
         except Exception as e:
+            self._mark_run_status(simulation_run, 'failed')
             self.stdout.write(
                 self.style.ERROR(f"Erreur lors de la simulation: {e}")
             )
             raise CommandError(f"Échec de la simulation: {e}")
+
+    def _mark_run_status(self, simulation_run: Optional[SimulationRun],
+                         status: str) -> None:
+        """
+        Marque la transition de statut d'un run sans recharger le modèle.
+
+        UPDATE ciblé sur les seules colonnes de la transition : le run
+        ne reste pas indéfiniment 'running' après interruption ou échec,
+        et les JSON de config/résultats ne sont pas réécrits.
+        """
+        if simulation_run is None:
+            return
+        try:
+            SimulationRun.objects.filter(pk=simulation_run.pk).update(
+                status=status, end_time=datetime.now()
+            )
+        except Exception as e:
+            self.stdout.write(
+                self.style.WARNING(f"Erreur lors du marquage du statut: {e}")
+            )
     
     def _display_config(self, options, n_buyers: int, n_sellers: int):
         """Affiche la configuration de la simulation."""
@@ -232,58 +256,142 @@ class Command(BaseCommand):
                                     checkpoint_interval: int, simulation_run: Optional[SimulationRun],
                                     verbose: bool, no_save: bool) -> dict:
         """Exécute la simulation avec affichage du progrès."""
-        
-        for step in range(n_steps):
-            # Exécution de l'étape
-            step_metrics = manager.step()
-            
-            # Sauvegarde des métriques si activée
-            if simulation_run and not no_save:
-                self._save_step_metrics(simulation_run, step_metrics)
-            
-            # Affichage du progrès
-            if verbose or step % 10 == 0 or step == n_steps - 1:
-                progress = (step + 1) / n_steps * 100
-                self.stdout.write(
-                    f"Étape {step + 1:4d}/{n_steps} ({progress:5.1f}%) - "
-                    f"Transactions: {step_metrics['transactions_executed']:3d} - "
-                    f"Volume: {step_metrics['total_volume']:4d}",
-                    ending='\r' if not verbose else '\n'
-                )
-            
-            # Checkpoint
-            if checkpoint_interval > 0 and step % checkpoint_interval == 0 and step > 0:
-                manager._save_checkpoint(step)
-                if verbose:
-                    self.stdout.write(f"  Checkpoint sauvegardé à l'étape {step}")
-        
-        # Nouvelle ligne finale
-        if not verbose:
+
+        # Métriques accumulées et vidées par lots : un bulk_create par
+        # intervalle de checkpoint au lieu d'un INSERT (et sa
+        # transaction implicite) par étape
+        pending_metrics = []
+        flush_every = checkpoint_interval if checkpoint_interval > 0 else 100
+
+        # La ligne de progrès à retour chariot n'a de sens que sur un
+        # terminal ; hors TTY (redirection, CI), on s'épargne le
+        # formatage et l'écriture par étape
+        is_tty = self.stdout.isatty()
+
+        try:
+            for step in range(n_steps):
+                # Exécution de l'étape
+                step_metrics = manager.step()
+
+                # Sauvegarde des métriques si activée
+                if simulation_run and not no_save:
+                    pending_metrics.append(
+                        self._build_step_metric(simulation_run, step_metrics)
+                    )
+                    if len(pending_metrics) >= flush_every:
+                        self._flush_step_metrics(pending_metrics)
+
+                # Affichage du progrès (hors TTY, seul le mode verbose et
+                # la dernière étape écrivent)
+                if verbose or ((is_tty or step == n_steps - 1)
+                               and (step % 10 == 0 or step == n_steps - 1)):
+                    progress = (step + 1) / n_steps * 100
+                    self.stdout.write(
+                        f"Étape {step + 1:4d}/{n_steps} ({progress:5.1f}%) - "
+                        f"Transactions: {step_metrics['transactions_executed']:3d} - "
+                        f"Volume: {step_metrics['total_volume']:4d}",
+                        ending='\r' if not verbose and is_tty else '\n'
+                    )
+
+                # Checkpoint
+                if checkpoint_interval > 0 and step % checkpoint_interval == 0 and step > 0:
+                    manager._save_checkpoint(step)
+                    if verbose:
+                        self.stdout.write(f"  Checkpoint sauvegardé à l'étape {step}")
+        finally:
+            # Vidage du reliquat de métriques, y compris en cas
+            # d'interruption en cours de run
+            if pending_metrics:
+                self._flush_step_metrics(pending_metrics)
+
+        # Nouvelle ligne finale (clôt la ligne à retour chariot)
+        if not verbose and is_tty:
             self.stdout.write("")
-        
+
         # Génération des résultats finaux
         return manager._generate_final_results()
-    
-    def _save_step_metrics(self, simulation_run: SimulationRun, metrics: dict):
-        """Sauvegarde les métriques d'une étape."""
+
+    def _build_step_metric(self, simulation_run: SimulationRun,
+                           metrics: dict) -> SimulationMetric:
+        """Construit (sans persister) la métrique d'une étape."""
+        return SimulationMetric(
+            simulation=simulation_run,
+            step_number=metrics['step'],
+            orders_created=metrics['orders_created'],
+            transactions_executed=metrics['transactions_executed'],
+            total_volume=metrics['total_volume'],
+            total_value=Decimal(str(metrics['total_value'])),
+            active_agents=metrics.get('active_buyers', 0) + metrics.get('active_sellers', 0),
+            pending_orders=metrics.get('pending_orders', 0),
+            execution_time=metrics.get('duration_seconds', 0) * 1000,  # en ms
+            additional_data=metrics
+        )
+
+    def _flush_step_metrics(self, pending_metrics: list):
+        """
+        Persiste le lot de métriques accumulées puis le vide.
+
+        Sur PostgreSQL, le lot passe par COPY FROM STDIN : le flux
+        binaire évite l'analyse SQL par ligne des INSERT, qui devient
+        le coût dominant au-delà de ~1000 lignes par lot. Les autres
+        moteurs (SQLite en test) gardent le bulk_create.
+        """
         try:
-            SimulationMetric.objects.create(
-                simulation=simulation_run,
-                step_number=metrics['step'],
-                orders_created=metrics['orders_created'],
-                transactions_executed=metrics['transactions_executed'],
-                total_volume=metrics['total_volume'],
-                total_value=Decimal(str(metrics['total_value'])),
-                active_agents=metrics.get('active_buyers', 0) + metrics.get('active_sellers', 0),
-                pending_orders=metrics.get('pending_orders', 0),
-                execution_time=metrics.get('duration_seconds', 0) * 1000,  # en ms
-                additional_data=metrics
-            )
+            copied = (connection.vendor == 'postgresql'
+                      and self._copy_step_metrics(pending_metrics))
+            if not copied:
+                with transaction.atomic():
+                    SimulationMetric.objects.bulk_create(
+                        pending_metrics, batch_size=1000
+                    )
         except Exception as e:
             self.stdout.write(
                 self.style.WARNING(f"Erreur lors de la sauvegarde des métriques: {e}")
             )
-    
+        finally:
+            pending_metrics.clear()
+
+    def _copy_step_metrics(self, pending_metrics: list) -> bool:
+        """
+        Insère le lot de métriques via COPY (psycopg 3).
+
+        Renvoie False si le pilote ne fournit pas cursor.copy
+        (psycopg 2) : l'appelant repasse alors par bulk_create au lieu
+        de perdre le lot.
+        """
+        table = SimulationMetric._meta.db_table
+        columns = (
+            'created_at', 'updated_at', 'simulation_id', 'step_number',
+            'orders_created', 'transactions_executed', 'total_volume',
+            'total_value', 'active_agents', 'pending_orders',
+            'execution_time', 'additional_data'
+        )
+        sql = 'COPY "{}" ({}) FROM STDIN'.format(
+            table, ', '.join(f'"{column}"' for column in columns)
+        )
+        now = datetime.now()
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not hasattr(cursor, 'copy'):
+                return False
+            with cursor.copy(sql) as copy:
+                for metric in pending_metrics:
+                    copy.write_row((
+                        now,
+                        now,
+                        metric.simulation_id,
+                        metric.step_number,
+                        metric.orders_created,
+                        metric.transactions_executed,
+                        metric.total_volume,
+                        metric.total_value,
+                        metric.active_agents,
+                        metric.pending_orders,
+                        metric.execution_time,
+                        json.dumps(metric.additional_data, cls=JSONEncoder),
+                    ))
+        return True
+
     def _finalize_simulation_run(self, simulation_run: SimulationRun, results: dict):
         """Finalise l'enregistrement de simulation."""
         try:
@@ -296,8 +404,14 @@ class Command(BaseCommand):
             if 'export_path' in results:
                 simulation_run.results_file_path = str(results['export_path'])
             
-            simulation_run.save()
-            
+            # UPDATE limité aux colonnes modifiées : le JSON de config
+            # et les autres champs inchangés ne sont pas resérialisés
+            with transaction.atomic():
+                simulation_run.save(update_fields=[
+                    'end_time', 'duration_seconds', 'status',
+                    'results_summary', 'results_file_path'
+                ])
+
         except Exception as e:
             self.stdout.write(
                 self.style.WARNING(f"Erreur lors de la finalisation: {e}")
@@ -4,9 +4,10 @@ Gestionnaire de simulation pour orchestrer les agents et le marché.
 
 import random
 import time
-from datetime import datetime
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Any, Optional
+from typing import Deque, Dict, List, Any, Optional
 from pathlib import Path
 import logging
 
@@ -14,14 +15,24 @@ from django.db import transaction
 from django.conf import settings
 
 from core.models import Item
-from core.utils import save_json, generate_simulation_id, SimulationTimer
-from market.engine import MarketEngine
-from market.models import Order, Transaction
+from core.utils import (save_json, append_jsonl, encode_jsonl,
+                        cents_to_decimal, generate_simulation_id, SimulationTimer)
+from market.engine import MarketEngine, get_engine
+from market.models import Order, Transaction, MarketSnapshot
 from .agents import Agent, Buyer, Seller
-from .scenarios import BaseScenario, DemandDoubleScenario
+from .context import SimulationContext
+from .orders import CandidateOrder
+from .pool import AgentPool
+from .scenarios import AVAILABLE_SCENARIOS, BaseScenario
 
 logger = logging.getLogger('simulation')
 
+# Réservoirs partagés du processus : les balayages de paramètres qui
+# enchaînent les gestionnaires recyclent leurs agents au lieu de les
+# reconstruire
+_buyer_pool = AgentPool(Buyer)
+_seller_pool = AgentPool(Seller)
+
 
 class SimulationManager:
     """
@@ -33,7 +44,18 @@ class SimulationManager:
     - Collecte des métriques
     - Sauvegarde des résultats
     """
-    
+
+    #: Cadence des checkpoints 'base' complets entre les deltas
+    CHECKPOINT_BASE_EVERY = 10
+
+    #: Gabarit des métriques d'un tick sans activité (champs constants)
+    _EMPTY_METRICS_TEMPLATE = {
+        'orders_created': 0,
+        'transactions_executed': 0,
+        'total_volume': 0,
+        'total_value': 0.0,
+    }
+
     def __init__(self, market_engine: Optional[MarketEngine] = None, 
                  agents: Optional[List[Agent]] = None, config: Optional[Dict[str, Any]] = None):
         """
@@ -45,8 +67,23 @@ class SimulationManager:
             config: Configuration de la simulation
         """
         self.id = generate_simulation_id()
-        self.market_engine = market_engine or MarketEngine()
+        self.market_engine = market_engine or get_engine()
         self.agents = agents or []
+        # Index id -> agent maintenu en parallèle de la liste : les
+        # recherches post-transactions se font en O(1)
+        self._agents_by_id: Dict[str, Agent] = {
+            agent.id: agent for agent in self.agents
+        }
+        # Partitions par type et agrégats de trésorerie entretenus
+        # incrémentalement : les métriques par tick se lisent en O(1)
+        # au lieu d'un balayage isinstance + somme Decimal sur tous
+        # les agents
+        self._buyers: List[Buyer] = []
+        self._sellers: List[Seller] = []
+        self._buyer_cash_total = 0.0
+        self._seller_cash_total = 0.0
+        for agent in self.agents:
+            self._track_agent(agent, 1)
         self.config = config or {}
         
         # Paramètres de simulation
@@ -54,31 +91,77 @@ class SimulationManager:
         self.start_time = None
         self.end_time = None
         self.is_running = False
-        
-        # Collecte de données
-        self.metrics_history: List[Dict[str, Any]] = []
+        # Ancre temporelle : les étapes n'enregistrent qu'un décalage
+        # monotone, l'horodatage ISO n'est reconstruit qu'à l'export
+        self._wall_anchor = datetime.now()
+        self._mono_start = time.monotonic()
+        
+        # Collecte de données : l'historique complet est diffusé sur
+        # disque en NDJSON ; seule une fenêtre récente bornée reste en
+        # mémoire, et le résumé se calcule sur des accumulateurs
+        self.metrics_history: Deque[Dict[str, Any]] = deque(
+            maxlen=self.config.get('metrics_history_limit', 1000)
+        )
         self.results: Dict[str, Any] = {}
+        self._metrics_stream = None
+        self._steps_completed = 0
+        self._sum_transactions = 0
+        self._sum_volume = 0
+        self._sum_value = 0.0
         
         # Configuration
         self.checkpoint_interval = self.config.get('checkpoint_interval', 50)
+        # Le mélange par tick est optionnel : les agents sont déjà
+        # filtrés individuellement par tirage de probabilité d'action,
+        # l'ordre de parcours n'importe que si le scénario l'exige
+        self.shuffle_agents = self.config.get('shuffle_agents', True)
+        # Checkpoints incrémentaux : empreintes du dernier état
+        # sérialisé par agent, et cadence des bases complètes
+        self._agent_state_hash: Dict[str, int] = {}
+        self._checkpoints_written = 0
+        self._last_base_step: Optional[int] = None
         self.output_dir = Path(self.config.get('output_dir', settings.SIM_OUTPUT_DIR))
         self.scenario = self.config.get('scenario', 'baseline')
+        self._scenario_instance: Optional[BaseScenario] = None
         
         logger.info(f"Simulation {self.id} initialisée avec {len(self.agents)} agents")
     
+    def _track_agent(self, agent: Agent, sign: int) -> None:
+        """Intègre (ou retire) un agent des partitions et agrégats."""
+        if isinstance(agent, Buyer):
+            if sign > 0:
+                self._buyers.append(agent)
+            else:
+                self._buyers.remove(agent)
+            self._buyer_cash_total += sign * float(agent.cash)
+        elif isinstance(agent, Seller):
+            if sign > 0:
+                self._sellers.append(agent)
+            else:
+                self._sellers.remove(agent)
+            self._seller_cash_total += sign * float(agent.cash)
+
     def add_agent(self, agent: Agent) -> None:
         """Ajoute un agent à la simulation."""
-        if agent not in self.agents:
+        if agent.id not in self._agents_by_id:
             self.agents.append(agent)
+            self._agents_by_id[agent.id] = agent
+            self._track_agent(agent, 1)
             logger.debug(f"Agent {agent.id} ajouté à la simulation")
-    
+
     def remove_agent(self, agent_id: str) -> bool:
         """Retire un agent de la simulation."""
-        for agent in self.agents:
-            if agent.id == agent_id:
-                self.agents.remove(agent)
-                logger.debug(f"Agent {agent_id} retiré de la simulation")
-                return True
+        agent = self._agents_by_id.pop(agent_id, None)
+        if agent is not None:
+            self.agents.remove(agent)
+            self._track_agent(agent, -1)
+            # Restitution au réservoir du processus pour réutilisation
+            if isinstance(agent, Buyer):
+                _buyer_pool.release(agent)
+            elif isinstance(agent, Seller):
+                _seller_pool.release(agent)
+            logger.debug(f"Agent {agent_id} retiré de la simulation")
+            return True
         return False
     
     def initialize_market(self, n_items: int = 10) -> None:
@@ -92,17 +175,30 @@ class SimulationManager:
             logger.info("Création d'objets de collection pour la simulation")
             
             categories = ['cards', 'figurines', 'comics', 'toys', 'art']
-            
-            for i in range(n_items):
-                category = random.choice(categories)
-                item = Item.objects.create(
+
+            # Tirages groupés en amont de la boucle : un appel
+            # random.choices pour les catégories, compréhensions à
+            # méthode liée pour éditions et tirages
+            randint = random.randint
+            drawn_categories = random.choices(categories, k=n_items)
+            editions = [randint(1, 5) for _ in range(n_items)]
+            supplies = [randint(100, 1000) for _ in range(n_items)]
+
+            # Construction en mémoire puis insertion multi-lignes :
+            # un seul INSERT par lot au lieu d'un par objet
+            items_to_create = [
+                Item(
                     name=f"Objet {i+1} - {category.capitalize()}",
                     category=category,
-                    edition=f"Édition {random.randint(1, 5)}",
-                    total_supply=random.randint(100, 1000),
+                    edition=f"Édition {editions[i]}",
+                    total_supply=supplies[i],
                     description=f"Objet de collection de la catégorie {category}"
                 )
-                logger.debug(f"Objet créé: {item}")
+                for i, category in enumerate(drawn_categories)
+            ]
+            with transaction.atomic():
+                Item.objects.bulk_create(items_to_create, batch_size=500)
+            logger.debug(f"{len(items_to_create)} objets créés")
     
     def create_agents(self, n_buyers: int = 30, n_sellers: int = 20) -> None:
         """
@@ -112,20 +208,20 @@ class SimulationManager:
             n_buyers: Nombre d'acheteurs à créer
             n_sellers: Nombre de vendeurs à créer
         """
-        # Création des acheteurs
-        for i in range(n_buyers):
-            buyer = Buyer(
-                agent_id=f"buyer_{i+1}",
-                initial_cash=Decimal(str(random.uniform(500, 2000)))
-            )
+        # Tirages de capitaux groupés avant les boucles de construction
+        uniform = random.uniform
+        buyer_cash = [Decimal(str(uniform(500, 2000))) for _ in range(n_buyers)]
+        seller_cash = [Decimal(str(uniform(300, 1500))) for _ in range(n_sellers)]
+
+        # Création des acheteurs (instances recyclées si le réservoir
+        # du processus en détient)
+        for i, cash in enumerate(buyer_cash):
+            buyer = _buyer_pool.acquire(f"buyer_{i+1}", cash)
             self.add_agent(buyer)
-        
+
         # Création des vendeurs
-        for i in range(n_sellers):
-            seller = Seller(
-                agent_id=f"seller_{i+1}",
-                initial_cash=Decimal(str(random.uniform(300, 1500)))
-            )
+        for i, cash in enumerate(seller_cash):
+            seller = _seller_pool.acquire(f"seller_{i+1}", cash)
             self.add_agent(seller)
         
         logger.info(f"Agents créés: {n_buyers} acheteurs, {n_sellers} vendeurs")
@@ -144,23 +240,46 @@ class SimulationManager:
         # Application du scénario
         self._apply_scenario()
         
-        # Actions des agents
-        random.shuffle(self.agents)  # Ordre aléatoire pour équité
-        
+        # Actions des agents, avec un contexte partagé pour l'étape
+        # (les requêtes communes ne sont exécutées qu'une fois par tick)
+        step_ctx = SimulationContext()
+        if self.shuffle_agents:
+            random.shuffle(self.agents)  # Ordre aléatoire pour équité
+
+        # Collecte des ordres produits, soumission en lot en fin de tour.
+        # Invariants de boucle liés localement : sur des milliers
+        # d'agents, les résolutions d'attributs répétées pèsent
+        produced = []
+        append_produced = produced.append
+        engine = self.market_engine
+        step_number = self.current_step
+
         for agent in self.agents:
             try:
-                order = agent.act(self.market_engine, self.current_step)
+                order = agent.act_fn(engine, step_number, step_ctx)
                 if order:
-                    # Soumission de l'ordre au marché
-                    executed_order = self.market_engine.submit_order(order)
-                    orders_created.append(executed_order)
-                    
-                    # Mise à jour de l'agent
-                    agent.active_orders.append(executed_order.id)
-                    agent.order_history.append(executed_order)
-                    
+                    # Les stratégies produisent des CandidateOrder légers ;
+                    # le modèle Order n'est construit qu'ici, à la
+                    # frontière de la persistance
+                    if isinstance(order, CandidateOrder):
+                        order = order.to_order()
+                    append_produced((agent, order))
             except Exception as e:
                 logger.error(f"Erreur avec agent {agent.id}: {e}")
+
+        if produced:
+            try:
+                # Un seul bulk_create pour tout le tick au lieu d'un
+                # INSERT par agent
+                self.market_engine.submit_orders([order for _, order in produced])
+
+                # Mise à jour des agents
+                for agent, order in produced:
+                    orders_created.append(order)
+                    agent.active_orders.append(order.id)
+                    agent.order_history.append(order)
+            except Exception as e:
+                logger.error(f"Erreur lors de la soumission du lot d'ordres: {e}")
         
         # Matching global des ordres restants
         new_transactions = self.market_engine.match_orders()
@@ -175,23 +294,60 @@ class SimulationManager:
         )
         
         self.metrics_history.append(step_metrics)
+        self._stream_step_metrics(step_metrics)
+
+        # Accumulateurs du résumé, tenus en ligne
+        self._steps_completed += 1
+        self._sum_transactions += step_metrics['transactions_executed']
+        self._sum_volume += step_metrics['total_volume']
+        self._sum_value += step_metrics['total_value']
+
         self.current_step += 1
-        
+
         return step_metrics
+
+    def _stream_step_metrics(self, step_metrics: Dict[str, Any]) -> None:
+        """Ajoute la métrique d'étape au journal NDJSON de la simulation."""
+        if self._metrics_stream is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            metrics_file = self.output_dir / f"{self.id}_metrics.jsonl"
+            self._metrics_stream = open(metrics_file, 'ab')
+
+        self._metrics_stream.write(encode_jsonl(step_metrics))
+
+    def _close_metrics_stream(self) -> None:
+        """Ferme le journal de métriques (vidage des tampons compris)."""
+        if self._metrics_stream is not None:
+            self._metrics_stream.close()
+            self._metrics_stream = None
     
     def _apply_scenario(self) -> None:
-        """Applique les effets du scénario courant."""
+        """
+        Applique les effets du scénario courant.
+
+        Le prédicat is_active filtre les étapes hors fenêtre d'action :
+        pour un scénario inerte (baseline, fenêtre passée), l'étape ne
+        paie qu'un test booléen au lieu de l'appel complet.
+        """
         scenario_obj = self._get_scenario_instance()
-        if scenario_obj:
+        if scenario_obj and scenario_obj.is_active(self.current_step):
             scenario_obj.apply_step_effects(self.current_step, self.agents, self.market_engine)
     
     def _get_scenario_instance(self) -> Optional[BaseScenario]:
-        """Récupère l'instance du scénario courant."""
-        scenarios = {
-            'baseline': BaseScenario(),
-            'demand_x2': DemandDoubleScenario()
-        }
-        return scenarios.get(self.scenario)
+        """
+        Récupère l'instance du scénario courant (construite une fois).
+
+        L'instance est résolue paresseusement depuis AVAILABLE_SCENARIOS
+        puis mise en cache : plus de dict ni d'objets scénario
+        reconstruits à chaque étape, et l'état interne du scénario
+        (sauvegardes, phases) survit d'un tick à l'autre.
+        """
+        if self._scenario_instance is None:
+            scenario_class = AVAILABLE_SCENARIOS.get(self.scenario)
+            if scenario_class is None:
+                return None
+            self._scenario_instance = scenario_class()
+        return self._scenario_instance
     
     def _update_agents_after_transactions(self, transactions: List[Transaction]) -> None:
         """
@@ -200,25 +356,44 @@ class SimulationManager:
         Args:
             transactions: Transactions exécutées
         """
+        # Première passe : accumulation des deltas nets par agent en
+        # ticks entiers (item_id lu sans déréférencer la relation) ;
+        # les méthodes de mutation ne sont ensuite appelées qu'une fois
+        # par agent touché, pas quatre fois par transaction
+        find_agent = self._agents_by_id.get
+        net_cash_ticks: Dict[Agent, int] = defaultdict(int)
+        net_inventory: Dict[Agent, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
         for transaction in transactions:
-            # Mise à jour de l'acheteur
-            buyer = self._find_agent(transaction.buyer_id)
+            value_ticks = int(transaction.price * 100) * transaction.quantity
+            item_id = transaction.item_id
+            quantity = transaction.quantity
+
+            buyer = find_agent(transaction.buyer_id)
             if buyer:
-                buyer.add_item(transaction.item.id, transaction.quantity)
-                buyer.update_cash(-transaction.total_value)
-            
-            # Mise à jour du vendeur
-            seller = self._find_agent(transaction.seller_id)
+                net_cash_ticks[buyer] -= value_ticks
+                net_inventory[buyer][item_id] += quantity
+
+            seller = find_agent(transaction.seller_id)
             if seller:
-                seller.remove_item(transaction.item.id, transaction.quantity)
-                seller.update_cash(transaction.total_value)
+                net_cash_ticks[seller] += value_ticks
+                net_inventory[seller][item_id] -= quantity
+
+        # Seconde passe : application des nets et entretien des
+        # agrégats de trésorerie
+        for agent, ticks in net_cash_ticks.items():
+            if ticks:
+                agent.update_cash(cents_to_decimal(ticks))
+                if isinstance(agent, Buyer):
+                    self._buyer_cash_total += ticks / 100.0
+                elif isinstance(agent, Seller):
+                    self._seller_cash_total += ticks / 100.0
+        for agent, deltas in net_inventory.items():
+            agent.apply_inventory_delta(deltas)
     
     def _find_agent(self, agent_id: str) -> Optional[Agent]:
-        """Trouve un agent par son ID."""
-        for agent in self.agents:
-            if agent.id == agent_id:
-                return agent
-        return None
+        """Trouve un agent par son ID (accès dict, O(1))."""
+        return self._agents_by_id.get(agent_id)
     
     def _collect_step_metrics(self, orders: List[Order], transactions: List[Transaction], 
                              duration: float) -> Dict[str, Any]:
@@ -233,31 +408,50 @@ class SimulationManager:
         Returns:
             Dict avec les métriques
         """
-        # Métriques de base
-        metrics = {
-            'step': self.current_step,
-            'timestamp': datetime.now().isoformat(),
-            'duration_seconds': duration,
-            'orders_created': len(orders),
-            'transactions_executed': len(transactions),
-            'total_volume': sum(t.quantity for t in transactions),
-            'total_value': float(sum(t.total_value for t in transactions)),
-        }
-        
-        # Métriques des agents
-        buyers = [a for a in self.agents if isinstance(a, Buyer)]
-        sellers = [a for a in self.agents if isinstance(a, Seller)]
-        
+        # Chemin rapide des ticks sans activité (cas dominant des
+        # scénarios calmes) : copie du gabarit constant, seuls les
+        # champs variables sont estampillés
+        if not transactions and not orders:
+            metrics = dict(self._EMPTY_METRICS_TEMPLATE)
+            metrics['step'] = self.current_step
+            metrics['t_offset_s'] = time.monotonic() - self._mono_start
+            metrics['duration_seconds'] = duration
+        else:
+            # Métriques de base ; valeur échangée agrégée en ticks
+            # entiers (une passe, pas d'additions Decimal)
+            total_volume = 0
+            value_ticks = 0
+            for t in transactions:
+                quantity = t.quantity
+                total_volume += quantity
+                value_ticks += int(t.price * 100) * quantity
+
+            metrics = {
+                'step': self.current_step,
+                't_offset_s': time.monotonic() - self._mono_start,
+                'duration_seconds': duration,
+                'orders_created': len(orders),
+                'transactions_executed': len(transactions),
+                'total_volume': total_volume,
+                'total_value': value_ticks / 100.0,
+            }
+        
+        # Métriques des agents : partitions et agrégats entretenus au
+        # fil des ajouts/retraits et des transactions, lecture O(1)
+        # sans balayage des agents
+        n_buyers = len(self._buyers)
+        n_sellers = len(self._sellers)
+
         metrics.update({
-            'active_buyers': len(buyers),
-            'active_sellers': len(sellers),
-            'avg_buyer_cash': float(sum(b.cash for b in buyers) / len(buyers)) if buyers else 0,
-            'avg_seller_cash': float(sum(s.cash for s in sellers) / len(sellers)) if sellers else 0,
+            'active_buyers': n_buyers,
+            'active_sellers': n_sellers,
+            'avg_buyer_cash': self._buyer_cash_total / n_buyers if n_buyers else 0,
+            'avg_seller_cash': self._seller_cash_total / n_sellers if n_sellers else 0,
         })
         
-        # Métriques du marché
-        total_orders = Order.objects.filter(status__in=['PENDING', 'PARTIAL']).count()
-        metrics['pending_orders'] = total_orders
+        # Métriques du marché : compteur en mémoire du moteur, pas de
+        # COUNT(*) SQL par étape
+        metrics['pending_orders'] = self.market_engine.pending_order_count()
         
         return metrics
     
@@ -276,6 +470,8 @@ class SimulationManager:
         
         with SimulationTimer(f"Simulation {self.id}"):
             self.start_time = datetime.now()
+            self._wall_anchor = self.start_time
+            self._mono_start = time.monotonic()
             self.is_running = True
             
             logger.info(f"Démarrage simulation {self.id} - {n_steps} étapes")
@@ -308,27 +504,79 @@ class SimulationManager:
                 self.is_running = False
                 logger.error(f"Erreur pendant la simulation: {e}")
                 raise
+            finally:
+                self._close_metrics_stream()
         
         return self.results
     
+    def _persist_market_snapshots(self) -> None:
+        """Persiste un instantané de marché par objet en une écriture batch."""
+        def to_decimal(value):
+            return Decimal(str(value)) if value is not None else None
+
+        snapshots = [
+            MarketSnapshot(
+                item_id=item_id,
+                best_bid=to_decimal(data['best_bid']),
+                best_ask=to_decimal(data['best_ask']),
+                last_price=to_decimal(data['last_price']),
+                volume_24h=data['volume_24h'],
+                data={'step': self.current_step, 'spread': data['spread']}
+            )
+            for item_id, data in self.market_engine.get_market_snapshot().items()
+        ]
+
+        if snapshots:
+            # Une seule requête multi-VALUES au lieu de N INSERTs
+            with transaction.atomic():
+                MarketSnapshot.objects.bulk_create(
+                    snapshots, batch_size=1000, ignore_conflicts=True
+                )
+
     def _save_checkpoint(self, step: int) -> None:
-        """Sauvegarde un checkpoint de la simulation."""
+        """
+        Sauvegarde un checkpoint de la simulation.
+
+        Snapshots incrémentaux : un checkpoint 'base' complet tous les
+        CHECKPOINT_BASE_EVERY, des 'delta' ne portant que les agents
+        dont l'état a changé entre-temps (comparaison par empreinte de
+        la sérialisation). Reconstruction : dernière base + deltas.
+        """
+        self._persist_market_snapshots()
+
+        is_base = self._checkpoints_written % self.CHECKPOINT_BASE_EVERY == 0
+        agents_payload = []
+        for agent in self.agents:
+            state = agent.to_dict()
+            fingerprint = hash(encode_jsonl(state))
+            if is_base or self._agent_state_hash.get(agent.id) != fingerprint:
+                agents_payload.append(state)
+            self._agent_state_hash[agent.id] = fingerprint
+
         checkpoint_data = {
             'simulation_id': self.id,
             'step': step,
+            'type': 'base' if is_base else 'delta',
+            'base_step': self._last_base_step if not is_base else step,
             'timestamp': datetime.now().isoformat(),
-            'agents': [agent.to_dict() for agent in self.agents],
+            'agents': agents_payload,
             'metrics_summary': self._calculate_summary_metrics()
         }
-        
-        checkpoint_file = self.output_dir / f"{self.id}_checkpoint_{step}.json"
-        save_json(checkpoint_data, checkpoint_file)
+        if is_base:
+            self._last_base_step = step
+        self._checkpoints_written += 1
+        
+        # Ajout en fin de journal NDJSON : un fichier unique par simulation,
+        # jamais réécrit en entier
+        checkpoint_file = self.output_dir / f"{self.id}_checkpoints.jsonl"
+        append_jsonl(checkpoint_data, checkpoint_file)
         logger.debug(f"Checkpoint sauvegardé: {checkpoint_file}")
     
     def _generate_final_results(self) -> Dict[str, Any]:
         """Génère le rapport final de la simulation."""
+        self._close_metrics_stream()
         duration = (self.end_time - self.start_time).total_seconds() if self.end_time else 0
-        
+
         results = {
             'simulation_id': self.id,
             'config': self.config,
@@ -339,29 +587,29 @@ class SimulationManager:
             'total_steps': self.current_step,
             'summary_metrics': self._calculate_summary_metrics(),
             'agent_results': [agent.to_dict() for agent in self.agents],
-            'step_metrics': self.metrics_history
+            # Fenêtre récente en mémoire ; l'historique complet est dans
+            # le journal NDJSON de la simulation
+            'step_metrics': list(self.metrics_history),
+            'step_metrics_file': str(self.output_dir / f"{self.id}_metrics.jsonl")
         }
         
         return results
     
     def _calculate_summary_metrics(self) -> Dict[str, Any]:
-        """Calcule les métriques de résumé."""
-        if not self.metrics_history:
+        """Calcule les métriques de résumé (accumulateurs en ligne, O(1))."""
+        steps = self._steps_completed
+        if not steps:
             return {}
-        
-        total_transactions = sum(m['transactions_executed'] for m in self.metrics_history)
-        total_volume = sum(m['total_volume'] for m in self.metrics_history)
-        total_value = sum(m['total_value'] for m in self.metrics_history)
-        
+
         return {
-            'total_transactions': total_transactions,
-            'total_volume': total_volume,
-            'total_value': total_value,
-            'avg_transactions_per_step': total_transactions / len(self.metrics_history),
-            'avg_volume_per_step': total_volume / len(self.metrics_history),
-            'avg_value_per_step': total_value / len(self.metrics_history),
+            'total_transactions': self._sum_transactions,
+            'total_volume': self._sum_volume,
+            'total_value': self._sum_value,
+            'avg_transactions_per_step': self._sum_transactions / steps,
+            'avg_volume_per_step': self._sum_volume / steps,
+            'avg_value_per_step': self._sum_value / steps,
             'final_agent_count': len(self.agents),
-            'steps_completed': len(self.metrics_history)
+            'steps_completed': steps
         }
     
     def export_results(self, filepath: Optional[Path] = None) -> Path:
@@ -379,6 +627,17 @@ class SimulationManager:
             filename = f"simulation_{timestamp}_{self.id}.json"
             filepath = self.output_dir / filename
         
+        # Reconstruction des horodatages ISO depuis les décalages
+        # monotones, une seule fois ici plutôt qu'à chaque étape
+        step_metrics = self.results.get('step_metrics')
+        if step_metrics:
+            anchor = self._wall_anchor
+            self.results['step_metrics'] = [
+                {**m, 'timestamp': (anchor + timedelta(seconds=m['t_offset_s'])).isoformat()}
+                if 't_offset_s' in m else m
+                for m in step_metrics
+            ]
+
         save_json(self.results, filepath)
         logger.info(f"Résultats exportés vers: {filepath}")
         
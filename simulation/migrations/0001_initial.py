@@ -0,0 +1,66 @@
+# Generated by Django 5.2.17 on 2026-08-27 23:18
+
+import core.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimulationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Dernière modification')),
+                ('simulation_id', models.CharField(max_length=100, unique=True, verbose_name='ID de simulation')),
+                ('scenario', models.CharField(max_length=50, verbose_name='Scénario utilisé')),
+                ('total_steps', models.PositiveIntegerField(verbose_name="Nombre d'étapes")),
+                ('total_agents', models.PositiveIntegerField(verbose_name="Nombre d'agents")),
+                ('start_time', models.DateTimeField(verbose_name='Heure de début')),
+                ('end_time', models.DateTimeField(blank=True, null=True, verbose_name='Heure de fin')),
+                ('duration_seconds', models.FloatField(blank=True, null=True, verbose_name='Durée (secondes)')),
+                ('status', models.CharField(choices=[('running', 'En cours'), ('completed', 'Terminée'), ('failed', 'Échouée'), ('cancelled', 'Annulée')], default='running', max_length=20, verbose_name='Statut')),
+                ('config', core.models.OrjsonJSONField(default=dict, verbose_name='Configuration')),
+                ('results_summary', core.models.OrjsonJSONField(blank=True, default=dict, verbose_name='Résumé des résultats')),
+                ('results_file_path', models.CharField(blank=True, max_length=500, verbose_name='Chemin du fichier de résultats')),
+            ],
+            options={
+                'verbose_name': 'Exécution de simulation',
+                'verbose_name_plural': 'Exécutions de simulation',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', '-created_at'], name='simrun_status_created')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SimulationMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Dernière modification')),
+                ('step_number', models.PositiveIntegerField(verbose_name="Numéro d'étape")),
+                ('orders_created', models.PositiveIntegerField(default=0, verbose_name='Ordres créés')),
+                ('transactions_executed', models.PositiveIntegerField(default=0, verbose_name='Transactions exécutées')),
+                ('total_volume', models.PositiveIntegerField(default=0, verbose_name='Volume total')),
+                ('total_value', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Valeur totale')),
+                ('active_agents', models.PositiveIntegerField(default=0, verbose_name='Agents actifs')),
+                ('pending_orders', models.PositiveIntegerField(default=0, verbose_name='Ordres en attente')),
+                ('execution_time', models.FloatField(default=0, verbose_name="Temps d'exécution (ms)")),
+                ('additional_data', core.models.OrjsonJSONField(blank=True, default=dict, verbose_name='Données supplémentaires')),
+                ('simulation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metrics', to='simulation.simulationrun', verbose_name='Simulation')),
+            ],
+            options={
+                'verbose_name': 'Métrique de simulation',
+                'verbose_name_plural': 'Métriques de simulation',
+                'ordering': ['simulation', 'step_number'],
+                'indexes': [models.Index(fields=['simulation', '-step_number'], name='simmetric_sim_step_desc')],
+                'unique_together': {('simulation', 'step_number')},
+            },
+        ),
+    ]
@@ -4,6 +4,7 @@ Modèles pour stocker les résultats de simulation.
 
 from django.db import models
 from core.mixins import TimeStampedMixin
+from core.models import OrjsonJSONField
 from typing import Dict, Any
 
 
@@ -59,12 +60,12 @@ class SimulationRun(TimeStampedMixin, models.Model):
         verbose_name="Statut"
     )
     
-    config = models.JSONField(
+    config = OrjsonJSONField(
         default=dict,
         verbose_name="Configuration"
     )
     
-    results_summary = models.JSONField(
+    results_summary = OrjsonJSONField(
         default=dict,
         blank=True,
         verbose_name="Résumé des résultats"
@@ -80,6 +81,12 @@ class SimulationRun(TimeStampedMixin, models.Model):
         verbose_name = "Exécution de simulation"
         verbose_name_plural = "Exécutions de simulation"
         ordering = ['-created_at']
+        indexes = [
+            # Les vues du dashboard filtrent par statut puis trient par
+            # récence : parcours d'index au lieu d'un filtre + tri
+            models.Index(fields=['status', '-created_at'],
+                         name='simrun_status_created'),
+        ]
     
     def __str__(self) -> str:
         return f"Simulation {self.simulation_id} - {self.scenario}"
@@ -95,11 +102,24 @@ class SimulationRun(TimeStampedMixin, models.Model):
         return self.status == 'completed'
 
 
+class SimulationMetricQuerySet(models.QuerySet):
+    """QuerySet des métriques avec les jointures usuelles."""
+
+    def with_sim(self) -> 'SimulationMetricQuerySet':
+        """
+        Joint la simulation parente (évite le N+1 de __str__ et des
+        listings qui affichent simulation_id).
+        """
+        return self.select_related('simulation')
+
+
 class SimulationMetric(TimeStampedMixin, models.Model):
     """
     Modèle pour stocker les métriques détaillées par étape.
     """
-    
+
+    objects = SimulationMetricQuerySet.as_manager()
+
     simulation = models.ForeignKey(
         SimulationRun,
         on_delete=models.CASCADE,
@@ -148,7 +168,7 @@ class SimulationMetric(TimeStampedMixin, models.Model):
         verbose_name="Temps d'exécution (ms)"
     )
     
-    additional_data = models.JSONField(
+    additional_data = OrjsonJSONField(
         default=dict,
         blank=True,
         verbose_name="Données supplémentaires"
@@ -160,7 +180,11 @@ class SimulationMetric(TimeStampedMixin, models.Model):
         ordering = ['simulation', 'step_number']
         unique_together = ['simulation', 'step_number']
         indexes = [
-            models.Index(fields=['simulation', 'step_number']),
+            # Variante descendante pour la pagination des dernières
+            # étapes ; l'ordre ascendant est déjà couvert par l'index
+            # unique de unique_together
+            models.Index(fields=['simulation', '-step_number'],
+                         name='simmetric_sim_step_desc'),
         ]
     
     def __str__(self) -> str:
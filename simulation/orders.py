@@ -0,0 +1,39 @@
+"""
+Représentation légère des ordres produits par les stratégies.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+
+from core.models import Item
+from market.models import Order
+
+
+@dataclass(slots=True)
+class CandidateOrder:
+    """
+    Ordre candidat, avant persistance.
+
+    L'__init__ d'un modèle Django est coûteux (descripteurs de champs,
+    suivi d'état, chargement différé) pour un objet qui peut encore
+    être rejeté ou écarté avant d'atteindre la base. Les stratégies
+    d'agents produisent ce dataclass à slots ; le modèle Order n'est
+    instancié qu'à la frontière de la persistance (voir
+    SimulationManager.step et MarketEngine.submit_order).
+    """
+
+    item: Item
+    agent_id: str
+    order_type: str
+    price: Decimal
+    quantity: int
+
+    def to_order(self) -> Order:
+        """Matérialise le modèle Order correspondant."""
+        return Order(
+            item=self.item,
+            agent_id=self.agent_id,
+            order_type=self.order_type,
+            price=self.price,
+            quantity=self.quantity,
+        )
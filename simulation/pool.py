@@ -0,0 +1,53 @@
+"""
+Réservoir d'agents réutilisables entre simulations.
+"""
+
+from collections import deque
+from decimal import Decimal
+from typing import Callable, Deque
+
+from .agents import Agent
+
+#: Taille maximale du stock d'instances conservées par réservoir
+POOL_MAX_SIZE = 10000
+
+
+class AgentPool:
+    """
+    Réservoir d'instances d'agents réinitialisables.
+
+    Les balayages de paramètres instancient des gestionnaires en série
+    et reconstruisent à chaque run des milliers d'agents : du pur coût
+    d'allocateur. Le réservoir restitue des instances existantes,
+    remises à neuf via Agent.reset, et n'appelle la fabrique qu'à
+    l'épuisement du stock.
+    """
+
+    def __init__(self, factory: Callable[..., Agent]):
+        """
+        Args:
+            factory: Classe ou fabrique d'agents (Buyer, Seller…)
+        """
+        self._factory = factory
+        self._available: Deque[Agent] = deque(maxlen=POOL_MAX_SIZE)
+
+    def acquire(self, agent_id: str, initial_cash: Decimal) -> Agent:
+        """
+        Fournit un agent prêt à l'emploi (recyclé si possible).
+
+        Args:
+            agent_id: Identifiant du nouvel agent
+            initial_cash: Capital initial
+
+        Returns:
+            Instance réinitialisée ou fraîchement construite
+        """
+        if self._available:
+            agent = self._available.pop()
+            agent.reset(agent_id, initial_cash)
+            return agent
+        return self._factory(agent_id, initial_cash)
+
+    def release(self, agent: Agent) -> None:
+        """Restitue un agent au réservoir pour une réutilisation future."""
+        self._available.append(agent)
@@ -4,14 +4,22 @@ Scénarios de simulation pour différentes expériences de marché.
 
 import random
 from abc import ABC, abstractmethod
-from typing import List, Any
-from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, Dict, List, Tuple
+from decimal import Context, Decimal, localcontext
 import logging
 
 from market.engine import MarketEngine
 
+from .agents import Buyer, Seller
+
 logger = logging.getLogger('simulation')
 
+# Contexte Decimal allégé pour l'arithmétique monétaire des scénarios :
+# les prix du marché tiennent en 4 à 6 chiffres significatifs, inutile
+# de payer la précision par défaut de 28 chiffres
+_MONEY_CONTEXT = Context(prec=9)
+
 
 class BaseScenario(ABC):
     """
@@ -42,7 +50,25 @@ class BaseScenario(ABC):
             market: Moteur de marché
         """
         pass
-    
+
+    def is_active(self, step: int) -> bool:
+        """
+        Indique si le scénario a un effet à cette étape.
+
+        Le gestionnaire interroge ce prédicat avant d'appeler
+        apply_step_effects : les scénarios dont la fenêtre d'action est
+        connue à l'avance évitent ainsi un appel Python par étape hors
+        fenêtre. Par défaut, le scénario est considéré actif à chaque
+        étape.
+
+        Args:
+            step: Numéro de l'étape courante
+
+        Returns:
+            True si apply_step_effects doit être appelé
+        """
+        return True
+
     def get_description(self) -> str:
         """Retourne une description du scénario."""
         return f"Scénario: {self.name}"
@@ -66,7 +92,7 @@ class BaselineScenario(BaseScenario):
     def apply_step_effects(self, step: int, agents: List[Any], market: MarketEngine) -> None:
         """
         Scénario baseline - aucune intervention.
-        
+
         Args:
             step: Étape courante
             agents: Agents participants
@@ -74,7 +100,11 @@ class BaselineScenario(BaseScenario):
         """
         # Aucune modification dans le scénario de base
         pass
-    
+
+    def is_active(self, step: int) -> bool:
+        """Jamais actif : l'appel par étape est entièrement évité."""
+        return False
+
     def get_description(self) -> str:
         return "Scénario de base sans événements externes"
 
@@ -107,54 +137,94 @@ class DemandDoubleScenario(BaseScenario):
             'demand_multiplier': 2.0
         }
         
+        # Partition des acheteurs figée au déclenchement de la fenêtre,
+        # réutilisée à chaque étape sans nouveau balayage isinstance
+        self._boosted_buyers: List[Any] = []
+        # Valeurs d'origine détenues par le scénario (budget, risque)
+        # par id d'agent, plutôt que des attributs posés sur les agents
+        self._snapshots: Dict[str, Tuple[Decimal, float]] = {}
+
         logger.info(f"Scénario Demand x2: début étape {trigger_step}, durée {duration} étapes")
-    
+
     def apply_step_effects(self, step: int, agents: List[Any], market: MarketEngine) -> None:
         """
         Applique les effets de doublement de demande.
-        
+
         Args:
             step: Étape courante
             agents: Agents participants
             market: Moteur de marché
         """
         if self.trigger_step <= step < self.end_step:
-            # Période de demande accrue
-            self._boost_buying_activity(agents, step)
-            
-            # Log du déclenchement
-            if step == self.trigger_step:
+            # Les valeurs boostées ne changent pas pendant la fenêtre :
+            # le boost est appliqué une seule fois, à la première étape
+            # effective, puis les étapes suivantes sont des non-ops
+            if not self._boosted_buyers:
+                self._capture_buyers(agents)
+                self._boost_buying_activity(step)
                 logger.info(f"Étape {step}: Activation du boost de demande x2")
-        
+
         elif step == self.end_step:
+            self._restore_buyers()
             logger.info(f"Étape {step}: Fin du boost de demande")
-    
-    def _boost_buying_activity(self, agents: List[Any], step: int) -> None:
+
+    def is_active(self, step: int) -> bool:
+        """Actif dans la fenêtre de boost et à l'étape de fin."""
+        return self.trigger_step <= step <= self.end_step
+
+    def _capture_buyers(self, agents: List[Any]) -> None:
         """
-        Augmente l'activité d'achat des agents.
-        
+        Fige la partition des acheteurs et leurs valeurs d'origine.
+
         Args:
             agents: Liste des agents
+        """
+        budget_boost = Decimal('1.5')
+        self._boosted_buyers = []
+        snapshots = self._snapshots
+        with localcontext(_MONEY_CONTEXT):
+            for agent in agents:
+                if not isinstance(agent, Buyer):
+                    continue
+                snapshot = snapshots.get(agent.id)
+                if snapshot is None:
+                    snapshot = snapshots[agent.id] = (
+                        agent.budget_per_item, agent.risk_tolerance
+                    )
+                original_budget, original_risk = snapshot
+                # Valeurs boostées calculées une fois : l'arithmétique
+                # Decimal sort du chemin par étape de la fenêtre
+                self._boosted_buyers.append((
+                    agent,
+                    original_budget * budget_boost,
+                    min(original_risk * 1.3, 0.95),
+                ))
+
+    def _boost_buying_activity(self, step: int) -> None:
+        """
+        Augmente l'activité d'achat des acheteurs de la fenêtre.
+
+        Args:
             step: Étape courante
         """
-        from .agents import Buyer
-        
-        buyers = [agent for agent in agents if isinstance(agent, Buyer)]
-        
-        for buyer in buyers:
-            # Augmentation temporaire du budget disponible
-            if not hasattr(buyer, '_original_budget'):
-                buyer._original_budget = buyer.budget_per_item
-            
+        for buyer, boosted_budget, boosted_risk in self._boosted_buyers:
             # Double le budget temporairement (effet psychologique)
-            buyer.budget_per_item = buyer._original_budget * Decimal('1.5')
-            
+            buyer.budget_per_item = boosted_budget
+
             # Augmente la tolérance au risque temporairement
-            if not hasattr(buyer, '_original_risk'):
-                buyer._original_risk = buyer.risk_tolerance
-            
-            buyer.risk_tolerance = min(buyer._original_risk * 1.3, 0.95)
-    
+            buyer.risk_tolerance = boosted_risk
+
+    def _restore_buyers(self) -> None:
+        """Restaure les valeurs d'origine des acheteurs boostés."""
+        snapshots = self._snapshots
+        for buyer, _boosted_budget, _boosted_risk in self._boosted_buyers:
+            snapshot = snapshots.pop(buyer.id, None)
+            if snapshot is None:
+                continue
+            buyer.budget_per_item, buyer.risk_tolerance = snapshot
+
+        self._boosted_buyers = []
+
     def get_description(self) -> str:
         return f"Doublement de la demande de l'étape {self.trigger_step} à {self.end_step}"
 
@@ -197,7 +267,11 @@ class VolatilitySpike(BaseScenario):
         if step == self.trigger_step:
             self._trigger_volatility(agents)
             logger.info(f"Étape {step}: Déclenchement du pic de volatilité x{self.intensity}")
-    
+
+    def is_active(self, step: int) -> bool:
+        """Actif uniquement à l'étape de déclenchement."""
+        return step == self.trigger_step
+
     def _trigger_volatility(self, agents: List[Any]) -> None:
         """
         Déclenche la volatilité en modifiant les agents.
@@ -205,17 +279,16 @@ class VolatilitySpike(BaseScenario):
         Args:
             agents: Liste des agents
         """
+        # Une seule écriture de risk_tolerance par agent : le facteur
+        # et la borne sont calculés localement avant l'affectation, le
+        # setter (qui resynchronise les constantes dérivées) n'est
+        # déclenché qu'une fois au lieu de deux
+        rnd = random.random
         for agent in agents:
-            # Augmente temporairement l'aversion au risque ou l'inverse
-            if random.random() < 0.5:
-                # Certains agents deviennent plus prudents
-                agent.risk_tolerance *= 0.7
-            else:
-                # D'autres deviennent plus agressifs
-                agent.risk_tolerance *= 1.4
-            
-            # Borne les valeurs
-            agent.risk_tolerance = max(0.1, min(0.9, agent.risk_tolerance))
+            # Certains agents deviennent plus prudents, d'autres plus
+            # agressifs
+            value = agent.risk_tolerance * (0.7 if rnd() < 0.5 else 1.4)
+            agent.risk_tolerance = max(0.1, min(0.9, value))
 
 
 class MarketCrash(BaseScenario):
@@ -255,7 +328,11 @@ class MarketCrash(BaseScenario):
             self._trigger_crash(agents)
             self.triggered = True
             logger.warning(f"Étape {step}: Déclenchement du krach de marché")
-    
+
+    def is_active(self, step: int) -> bool:
+        """Actif à l'étape de déclenchement tant que non déclenché."""
+        return step == self.trigger_step and not self.triggered
+
     def _trigger_crash(self, agents: List[Any]) -> None:
         """
         Déclenche le krach en forçant des ventes.
@@ -263,19 +340,18 @@ class MarketCrash(BaseScenario):
         Args:
             agents: Liste des agents
         """
-        from .agents import Seller
-        
         sellers = [agent for agent in agents if isinstance(agent, Seller)]
-        
+
         # Force une partie des vendeurs à vendre en urgence
-        panic_sellers = random.sample(sellers, min(len(sellers), len(sellers) // 2))
-        
+        panic_sellers = random.sample(sellers, len(sellers) // 2)
+
+        # Constantes hoistées hors de la boucle de panique
+        panic_target = Decimal('0.8')  # Vente à perte
         for seller in panic_sellers:
             # Réduit drastiquement le target de profit
-            seller.profit_target = Decimal('0.8')  # Vente à perte
+            seller.profit_target = panic_target
             # Augmente l'urgence
-            if hasattr(seller, 'patience'):
-                seller.patience = 0.1
+            seller.patience = 0.1
 
 
 class LiquidityDrain(BaseScenario):
@@ -298,6 +374,8 @@ class LiquidityDrain(BaseScenario):
         self.trigger_step = trigger_step
         self.affected_ratio = affected_ratio
         self.affected_agents = []
+        # Patience d'origine par id d'agent, détenue par le scénario
+        self._snapshots: Dict[str, float] = {}
         
         self.parameters = {
             'description': 'Réduction temporaire de la liquidité',
@@ -321,7 +399,11 @@ class LiquidityDrain(BaseScenario):
         elif step == self.trigger_step + 20:  # Fin après 20 étapes
             self._end_liquidity_drain()
             logger.info(f"Étape {step}: Fin du drain de liquidité")
-    
+
+    def is_active(self, step: int) -> bool:
+        """Actif aux étapes de début et de fin du drain."""
+        return step == self.trigger_step or step == self.trigger_step + 20
+
     def _start_liquidity_drain(self, agents: List[Any]) -> None:
         """
         Commence le drain en réduisant l'activité de certains agents.
@@ -334,28 +416,29 @@ class LiquidityDrain(BaseScenario):
         
         for agent in self.affected_agents:
             # Sauvegarde les valeurs originales
-            agent._original_patience = getattr(agent, 'patience', 0.5)
+            self._snapshots[agent.id] = agent.patience
             # Réduit drastiquement l'activité
             agent.patience = 0.05  # Très peu probable de placer des ordres
-    
+
     def _end_liquidity_drain(self) -> None:
         """Restaure l'activité des agents affectés."""
         for agent in self.affected_agents:
-            if hasattr(agent, '_original_patience'):
-                agent.patience = agent._original_patience
-                delattr(agent, '_original_patience')
-        
+            original = self._snapshots.pop(agent.id, None)
+            if original is not None:
+                agent.patience = original
+
         self.affected_agents.clear()
 
 
-# Factory pour créer les scénarios
-AVAILABLE_SCENARIOS = {
+# Factory pour créer les scénarios (vue immuable : le registre n'est
+# pas modifiable à l'exécution)
+AVAILABLE_SCENARIOS = MappingProxyType({
     'baseline': BaselineScenario,
     'demand_x2': DemandDoubleScenario,
     'volatility_spike': VolatilitySpike,
     'market_crash': MarketCrash,
     'liquidity_drain': LiquidityDrain
-}
+})
 
 
 def create_scenario(scenario_name: str, **kwargs) -> BaseScenario:
@@ -372,9 +455,10 @@ def create_scenario(scenario_name: str, **kwargs) -> BaseScenario:
     Raises:
         ValueError: Si le scénario n'existe pas
     """
-    if scenario_name not in AVAILABLE_SCENARIOS:
-        available = ', '.join(AVAILABLE_SCENARIOS.keys())
+    # Une seule sonde de dict : get puis test de None
+    scenario_class = AVAILABLE_SCENARIOS.get(scenario_name)
+    if scenario_class is None:
+        available = ', '.join(AVAILABLE_SCENARIOS)
         raise ValueError(f"Scénario '{scenario_name}' inconnu. Disponibles: {available}")
-    
-    scenario_class = AVAILABLE_SCENARIOS[scenario_name]
+
     return scenario_class(**kwargs)
\ No newline at end of file
@@ -2,6 +2,8 @@
 Tests pour l'app simulation.
 """
 
+import random
+
 import pytest
 from decimal import Decimal
 from unittest.mock import patch, MagicMock
@@ -99,15 +101,23 @@ class AgentTest(TestCase):
 
 class BuyerTest(TestCase):
     """Tests pour la classe Buyer."""
-    
+
+    @classmethod
+    def setUpTestData(cls):
+        """Fixture partagée, créée une fois pour toute la classe."""
+        cls.item, = Item.objects.bulk_create([
+            Item(
+                name='Test Card',
+                category=ItemCategory.TRADING_CARDS,
+                total_supply=100
+            )
+        ])
+        # Moteur partagé par la classe ; l'isolement par test est assuré
+        # par la copie que Django fait des attributs de setUpTestData
+        cls.market_engine = MarketEngine()
+
     def setUp(self):
-        """Initialisation des données de test."""
-        self.item = Item.objects.create(
-            name='Test Card',
-            category=ItemCategory.TRADING_CARDS,
-            total_supply=100
-        )
-        self.market_engine = MarketEngine()
+        """Initialisation de l'état mutable par test."""
         self.buyer = Buyer('buyer_001', Decimal('1000.00'))
     
     def test_buyer_initialization(self):
@@ -157,15 +167,23 @@ class BuyerTest(TestCase):
 
 class SellerTest(TestCase):
     """Tests pour la classe Seller."""
-    
+
+    @classmethod
+    def setUpTestData(cls):
+        """Fixture partagée, créée une fois pour toute la classe."""
+        cls.item, = Item.objects.bulk_create([
+            Item(
+                name='Test Card',
+                category=ItemCategory.TRADING_CARDS,
+                total_supply=100
+            )
+        ])
+        # Moteur partagé par la classe ; l'isolement par test est assuré
+        # par la copie que Django fait des attributs de setUpTestData
+        cls.market_engine = MarketEngine()
+
     def setUp(self):
-        """Initialisation des données de test."""
-        self.item = Item.objects.create(
-            name='Test Card',
-            category=ItemCategory.TRADING_CARDS,
-            total_supply=100
-        )
-        self.market_engine = MarketEngine()
+        """Initialisation de l'état mutable par test."""
         self.seller = Seller('seller_001', Decimal('500.00'))
     
     def test_seller_initialization(self):
@@ -285,11 +303,40 @@ class SimulationManagerTest(TestCase):
         
         assert isinstance(metrics, dict)
         assert 'step' in metrics
-        assert 'timestamp' in metrics
+        assert 't_offset_s' in metrics
         assert 'orders_created' in metrics
         assert 'transactions_executed' in metrics
         assert self.manager.current_step == 1
-    
+
+    def test_simulation_step_query_count(self):
+        """Garde-fou : le nombre de requêtes d'une étape est borné.
+
+        Graine fixée pour rendre les actions des agents déterministes ;
+        verrouille les optimisations N+1 (lots d'ordres, caches du
+        contexte, carnet en mémoire) contre les régressions.
+        """
+        # Neutralisation de l'état global du processus (réservoirs
+        # d'agents, mémo des objets de départ des vendeurs, cache des
+        # instantanés de marché, carnets en mémoire du moteur singleton)
+        # pour que le décompte ne dépende pas des tests déjà exécutés
+        from django.core.cache import cache
+
+        from . import manager as manager_module
+        manager_module._buyer_pool._available.clear()
+        manager_module._seller_pool._available.clear()
+        Seller._seed_item_ids = None
+        cache.clear()
+        manager = SimulationManager(
+            config=self.config, market_engine=MarketEngine()
+        )
+
+        random.seed(4242)
+        manager.initialize_market(n_items=2)
+        manager.create_agents(n_buyers=2, n_sellers=2)
+
+        with self.assertNumQueries(19):
+            manager.step()
+
     def test_get_status(self):
         """Test de récupération du statut."""
         self.manager.create_agents(n_buyers=2, n_sellers=1)
@@ -5,18 +5,21 @@ Formulaires pour l'interface utilisateur.
 from django import forms
 from simulation.scenarios import AVAILABLE_SCENARIOS
 
+# Choix des scénarios, construits une fois à l'import : tuple figé,
+# partagé par toutes les instances du formulaire
+SCENARIO_CHOICES = tuple(
+    (name, name.replace('_', ' ').title())
+    for name in AVAILABLE_SCENARIOS
+)
+
 
 class SimulationForm(forms.Form):
     """
     Formulaire pour configurer et lancer une nouvelle simulation.
     """
-    
-    # Choix des scénarios
-    SCENARIO_CHOICES = [
-        (name, name.replace('_', ' ').title()) 
-        for name in AVAILABLE_SCENARIOS.keys()
-    ]
-    
+
+    SCENARIO_CHOICES = SCENARIO_CHOICES
+
     scenario = forms.ChoiceField(
         choices=SCENARIO_CHOICES,
         initial='baseline',
@@ -2,88 +2,183 @@
 Vues pour l'interface utilisateur de l'application de simulation de marché.
 """
 
+import hashlib
 import json
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, time, timedelta
 from decimal import Decimal
 from pathlib import Path
 from typing import Dict, Any, List
 
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse, Http404
+from django.http import JsonResponse, FileResponse, Http404
 from django.urls import reverse
-from django.core.paginator import Paginator
+from django.db import connections
 from django.db.models import Sum, Count, Avg
+from django.db.models.functions import TruncDate
 from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 import logging
 
-from core.models import Item
+from core.models import Item, ItemCategory
 from core.utils import load_json
 from market.models import Order, Transaction
 from simulation.models import SimulationRun, SimulationMetric
 from simulation.manager import SimulationManager
 from simulation.scenarios import create_scenario
-from market.engine import MarketEngine
+from market.engine import get_engine
 from .forms import SimulationForm
 
 logger = logging.getLogger(__name__)
 
+#: Nombre maximal d'étapes chargées pour les graphiques de détail
+CHART_WINDOW_STEPS = 1000
 
-def dashboard(request):
+#: Libellés de catégorie résolus une fois à l'import, au lieu d'un
+#: get_category_display (résolution des choices) par ligne affichée
+CATEGORY_LABELS = dict(ItemCategory.choices)
+
+#: Nombre maximal de points effectivement tracés par série
+CHART_MAX_POINTS = 200
+
+
+def _downsample_metrics(rows: List[Dict[str, Any]],
+                        max_points: int = CHART_MAX_POINTS) -> List[Dict[str, Any]]:
     """
-    Vue principale du dashboard avec résumé des activités.
+    Rééchantillonne les lignes de métriques par moyennes de seaux.
+
+    Un graphique ne résout pas visuellement des milliers de points :
+    au-delà de max_points, les lignes sont regroupées en seaux
+    contigus dont les valeurs sont moyennées (l'étape retenue est celle
+    de fin de seau). Le payload JSON et le rendu navigateur restent
+    bornés quelle que soit la longueur du run.
+
+    Args:
+        rows: Lignes de métriques en ordre chronologique
+        max_points: Taille cible de la série
+
+    Returns:
+        Lignes d'origine si déjà assez courtes, sinon une ligne par seau
+    """
+    if len(rows) <= max_points:
+        return rows
+
+    stride = -(-len(rows) // max_points)  # Plafond entier
+    sampled = []
+    for start in range(0, len(rows), stride):
+        bucket = rows[start:start + stride]
+        n = len(bucket)
+        sampled.append({
+            'step_number': bucket[-1]['step_number'],
+            'orders_created': sum(r['orders_created'] for r in bucket) / n,
+            'transactions_executed': sum(r['transactions_executed'] for r in bucket) / n,
+            'total_volume': sum(r['total_volume'] for r in bucket) / n,
+            'total_value': sum(float(r['total_value']) for r in bucket) / n,
+        })
+    return sampled
+
+
+#: Durée de vie (s) du bloc statistiques + graphique du dashboard
+DASHBOARD_STATS_TTL = 30
+
+
+def _dashboard_payload() -> Dict[str, Any]:
     """
-    # Statistiques générales
+    Calcule le bloc statistiques + graphique 7 jours du dashboard.
+
+    Isolé pour être mis en cache : ces agrégats sont identiques pour
+    tous les visiteurs dans la fenêtre du TTL, inutile de les refaire
+    à chaque affichage.
+    """
+    # Statistiques générales ; les trois agrégats de Transaction sont
+    # calculés dans la même requête (un seul aller-retour)
+    transaction_aggregates = Transaction.objects.aggregate(
+        count=Count('id'),
+        total_volume=Sum('quantity'),
+        total_value=Sum('price'),
+    )
     stats = {
         'total_simulations': SimulationRun.objects.count(),
-        'total_transactions': Transaction.objects.aggregate(count=Count('id'))['count'] or 0,
-        'total_volume': Transaction.objects.aggregate(sum=Sum('quantity'))['sum'] or 0,
-        'total_value': Transaction.objects.aggregate(sum=Sum('price'))['sum'] or 0,
+        'total_transactions': transaction_aggregates['count'] or 0,
+        'total_volume': transaction_aggregates['total_volume'] or 0,
+        'total_value': transaction_aggregates['total_value'] or 0,
     }
-    
-    # Simulation en cours
-    running_simulation = SimulationRun.objects.filter(status='running').first()
-    if running_simulation:
-        # Calcul du pourcentage de progression (approximatif)
-        completed_steps = SimulationMetric.objects.filter(simulation=running_simulation).count()
-        if running_simulation.total_steps > 0:
-            running_simulation.progress_percent = (completed_steps / running_simulation.total_steps) * 100
-        else:
-            running_simulation.progress_percent = 0
-    
-    # Simulations récentes
-    recent_simulations = SimulationRun.objects.all().order_by('-created_at')[:10]
-    
+
     # Données pour le graphique (derniers 7 jours)
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=6)
-    
+
     chart_data = {
         'labels': [],
         'transactions': []
     }
-    
+
+    # Comptes journaliers en une seule requête GROUP BY (au lieu d'un
+    # COUNT par jour) ; les jours sans transaction sont complétés à 0.
+    # Le filtre est une borne datetime brute (et non timestamp__date,
+    # qui enroberait la colonne d'un cast) pour que l'index existant
+    # sur timestamp serve de borne de parcours
+    daily_counts = dict(
+        Transaction.objects.filter(
+            timestamp__gte=datetime.combine(start_date, time.min)
+        )
+        .annotate(day=TruncDate('timestamp'))
+        .values('day')
+        .annotate(c=Count('id'))
+        .values_list('day', 'c')
+    )
+
     for i in range(7):
         date = start_date + timedelta(days=i)
         chart_data['labels'].append(date.strftime('%d/%m'))
-        
-        daily_transactions = Transaction.objects.filter(
-            timestamp__date=date
-        ).count()
-        chart_data['transactions'].append(daily_transactions)
-    
+        chart_data['transactions'].append(daily_counts.get(date, 0))
+
+    return {'stats': stats, 'chart_data': chart_data}
+
+
+def dashboard(request):
+    """
+    Vue principale du dashboard avec résumé des activités.
+    """
+    # Bloc statistiques + graphique amorti par le cache : un calcul par
+    # fenêtre de TTL quel que soit le nombre de visiteurs
+    payload = cache.get_or_set(
+        'ui:dashboard:stats', _dashboard_payload, DASHBOARD_STATS_TTL
+    )
+
+    # Simulation en cours, hors cache : sa progression change d'une
+    # seconde à l'autre. Le compte d'étapes accomplies est annoté sur
+    # la même requête au lieu d'un COUNT séparé
+    running_simulation = SimulationRun.objects.filter(
+        status='running'
+    ).annotate(completed_steps=Count('metrics')).first()
+    if running_simulation:
+        # Calcul du pourcentage de progression (approximatif)
+        if running_simulation.total_steps > 0:
+            running_simulation.progress_percent = (
+                running_simulation.completed_steps / running_simulation.total_steps
+            ) * 100
+        else:
+            running_simulation.progress_percent = 0
+
+    # Simulations récentes
+    recent_simulations = SimulationRun.objects.all().order_by('-created_at')[:10]
+
     context = {
-        'stats': stats,
+        'stats': payload['stats'],
         'running_simulation': running_simulation,
         'recent_simulations': recent_simulations,
-        'chart_data': {
-            'labels': json.dumps(chart_data['labels']),
-            'transactions': json.dumps(chart_data['transactions'])
-        }
+        # Payload de graphique sérialisé en un seul bloc par le filtre
+        # json_script du gabarit, au lieu d'un json.dumps par champ
+        'chart_json': payload['chart_data']
     }
-    
+
     return render(request, 'ui/dashboard.html', context)
 
 
@@ -119,13 +214,67 @@ def simulation_form(request):
     return render(request, 'ui/simulation_form.html', {'form': form})
 
 
+def _execute_simulation(sim_run_pk: int, config: Dict[str, Any]) -> None:
+    """
+    Exécute une simulation complète (hors cycle requête/réponse).
+
+    Tourne dans un thread de fond : la préparation du marché, la
+    création des agents et les étapes ne bloquent plus un worker WSGI.
+    Le statut du SimulationRun est mis à jour en fin de course par un
+    UPDATE ciblé.
+
+    Args:
+        sim_run_pk: Clé primaire du SimulationRun à alimenter
+        config: Configuration nettoyée du formulaire
+    """
+    try:
+        manager = SimulationManager(
+            config={
+                'scenario': config['scenario'],
+                'checkpoint_interval': 50,
+                'output_dir': settings.SIM_OUTPUT_DIR
+            }
+        )
+
+        manager.initialize_market(n_items=config.get('n_items', 10))
+        manager.create_agents(
+            n_buyers=config['n_buyers'],
+            n_sellers=config['n_sellers']
+        )
+
+        results = manager.run(n_steps=config['n_steps'])
+        export_path = manager.export_results()
+
+        SimulationRun.objects.filter(pk=sim_run_pk).update(
+            status='completed',
+            end_time=datetime.now(),
+            duration_seconds=results.get('duration_seconds'),
+            results_summary=results.get('summary_metrics', {}),
+            results_file_path=str(export_path)
+        )
+
+    except Exception as e:
+        logger.error(f"Erreur lors de l'exécution de la simulation {sim_run_pk}: {e}")
+        SimulationRun.objects.filter(pk=sim_run_pk).update(
+            status='failed', end_time=datetime.now()
+        )
+    finally:
+        # Le thread détient sa propre connexion : elle est rendue
+        # explicitement au lieu d'attendre la fin du processus
+        connections.close_all()
+
+
 def _launch_simulation(config: Dict[str, Any]) -> Dict[str, Any]:
     """
     Lance une simulation avec la configuration donnée.
-    
+
+    La requête ne paie que la création du SimulationRun ; le travail
+    lourd (marché, agents, étapes) part dans un thread de fond et la
+    page de détail suit la progression via l'API de statut.
+
     Args:
         config: Configuration de la simulation
-        
+
     Returns:
         Dict avec le résultat du lancement
     """
@@ -140,33 +289,22 @@ def _launch_simulation(config: Dict[str, Any]) -> Dict[str, Any]:
             config=config,
             status='running'
         )
-        
-        # Configuration du SimulationManager
-        manager = SimulationManager(
-            config={
-                'scenario': config['scenario'],
-                'checkpoint_interval': 50,
-                'output_dir': settings.SIM_OUTPUT_DIR
-            }
-        )
-        
-        # Initialisation du marché et des agents
-        manager.initialize_market(n_items=config.get('n_items', 10))
-        manager.create_agents(
-            n_buyers=config['n_buyers'],
-            n_sellers=config['n_sellers']
+
+        worker = threading.Thread(
+            target=_execute_simulation,
+            args=(sim_run.pk, config),
+            name=f"simulation-{sim_run.simulation_id}",
+            daemon=True
         )
-        
-        # TODO: Lancer en arrière-plan avec Celery ou threading
-        # Pour l'instant, on simule un lancement réussi
-        
-        logger.info(f"Simulation {sim_run.simulation_id} configurée avec succès")
-        
+        worker.start()
+
+        logger.info(f"Simulation {sim_run.simulation_id} lancée en arrière-plan")
+
         return {
             'success': True,
             'simulation_id': sim_run.simulation_id
         }
-        
+
     except Exception as e:
         logger.error(f"Erreur lors du lancement de simulation: {e}")
         return {
@@ -175,28 +313,51 @@ def _launch_simulation(config: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+#: Taille de page de la liste des simulations
+SIMULATION_LIST_PAGE_SIZE = 20
+
+
 def simulation_list(request):
     """
-    Liste de toutes les simulations avec pagination.
+    Liste de toutes les simulations avec pagination par curseur.
+
+    La pagination par curseur (keyset) remplace le Paginator : plus de
+    COUNT(*) sur toute la table à chaque page, la requête descend
+    l'index created_at à partir du curseur et charge une ligne de plus
+    que la page pour savoir s'il existe une suite.
     """
-    simulations = SimulationRun.objects.all().order_by('-created_at')
-    
+    # Colonnes limitées à celles affichées par ligne : les JSON de
+    # config et de résumé de résultats ne sont pas rapatriés pour un
+    # listing
+    simulations = SimulationRun.objects.only(
+        'simulation_id', 'scenario', 'status', 'created_at',
+        'total_steps', 'total_agents', 'duration_seconds'
+    ).order_by('-created_at')
+
     # Filtrage par statut
     status_filter = request.GET.get('status')
     if status_filter:
         simulations = simulations.filter(status=status_filter)
-    
-    # Pagination
-    paginator = Paginator(simulations, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
+
+    # Curseur : created_at (ISO) de la dernière ligne de la page
+    # précédente ; un curseur illisible est ignoré
+    cursor = request.GET.get('cursor')
+    if cursor:
+        cursor_dt = parse_datetime(cursor)
+        if cursor_dt is not None:
+            simulations = simulations.filter(created_at__lt=cursor_dt)
+
+    rows = list(simulations[:SIMULATION_LIST_PAGE_SIZE + 1])
+    has_next = len(rows) > SIMULATION_LIST_PAGE_SIZE
+    rows = rows[:SIMULATION_LIST_PAGE_SIZE]
+
     context = {
-        'page_obj': page_obj,
+        'simulations': rows,
+        'next_cursor': rows[-1].created_at.isoformat() if has_next and rows else None,
         'status_filter': status_filter,
         'status_choices': SimulationRun._meta.get_field('status').choices
     }
-    
+
     return render(request, 'ui/simulation_list.html', context)
 
 
@@ -207,39 +368,68 @@ def simulation_detail(request, simulation_id: str):
     Args:
         simulation_id: Identifiant de la simulation
     """
-    simulation = get_object_or_404(SimulationRun, simulation_id=simulation_id)
-    
-    # Métriques de la simulation
-    metrics = SimulationMetric.objects.filter(
-        simulation=simulation
-    ).order_by('step_number')
-    
+    # Chargement sans les blobs JSON (config, résumé de résultats) que
+    # la page ne rend pas
+    simulation = get_object_or_404(
+        SimulationRun.objects.only(
+            'simulation_id', 'scenario', 'status', 'total_steps',
+            'total_agents', 'start_time', 'end_time', 'duration_seconds',
+            'results_file_path', 'created_at'
+        ),
+        simulation_id=simulation_id
+    )
+
+    metrics_qs = SimulationMetric.objects.filter(simulation=simulation)
+
+    # Statistiques de résumé agrégées en SQL : aucune ligne de métrique
+    # n'est rapatriée pour les totaux
+    aggregates = metrics_qs.aggregate(
+        total_transactions=Sum('transactions_executed'),
+        total_volume=Sum('total_volume'),
+        total_value=Sum('total_value'),
+        step_count=Count('id'),
+    )
+    step_count = aggregates['step_count'] or 0
+    peak_volume_step = metrics_qs.order_by('-total_volume').values_list(
+        'step_number', flat=True
+    ).first() or 0
+
+    summary_stats = {
+        'total_transactions': aggregates['total_transactions'] or 0,
+        'total_volume': aggregates['total_volume'] or 0,
+        'total_value': aggregates['total_value'] or 0,
+        'avg_transactions_per_step': (aggregates['total_transactions'] or 0) / step_count if step_count else 0,
+        'peak_volume_step': peak_volume_step,
+    }
+
+    # Métriques des graphiques bornées aux dernières étapes : sur les
+    # longs runs, la relation inverse complète ne tient pas en mémoire.
+    # Lignes values() plutôt qu'instances de modèle : quatre colonnes
+    # lues, pas de from_db par ligne
+    metrics = list(metrics_qs.values(
+        'step_number', 'orders_created', 'transactions_executed',
+        'total_volume', 'total_value'
+    ).order_by('-step_number')[:CHART_WINDOW_STEPS])
+    metrics.reverse()  # Ordre chronologique pour l'affichage
+
+    # Rééchantillonnage par seaux : la série tracée est bornée à
+    # CHART_MAX_POINTS quel que soit le nombre d'étapes du run
+    chart_rows = _downsample_metrics(metrics)
+
     # Données pour les graphiques
     chart_data = {
-        'steps': [m.step_number for m in metrics],
-        'transactions': [m.transactions_executed for m in metrics],
-        'volume': [m.total_volume for m in metrics],
-        'value': [float(m.total_value) for m in metrics]
-    }
-    
-    # Statistiques de résumé
-    summary_stats = {
-        'total_transactions': sum(m.transactions_executed for m in metrics),
-        'total_volume': sum(m.total_volume for m in metrics),
-        'total_value': sum(m.total_value for m in metrics),
-        'avg_transactions_per_step': sum(m.transactions_executed for m in metrics) / len(metrics) if metrics else 0,
-        'peak_volume_step': max(metrics, key=lambda x: x.total_volume).step_number if metrics else 0,
+        'steps': [m['step_number'] for m in chart_rows],
+        'transactions': [m['transactions_executed'] for m in chart_rows],
+        'volume': [m['total_volume'] for m in chart_rows],
+        'value': [float(m['total_value']) for m in chart_rows]
     }
     
     context = {
         'simulation': simulation,
         'metrics': metrics,
-        'chart_data': {
-            'steps': json.dumps(chart_data['steps']),
-            'transactions': json.dumps(chart_data['transactions']),
-            'volume': json.dumps(chart_data['volume']),
-            'value': json.dumps(chart_data['value'])
-        },
+        # Un seul json.dumps pour les quatre séries du graphique
+        'chart_json': json.dumps(chart_data, cls=DjangoJSONEncoder),
+        'chart_downsampled': len(chart_rows) < len(metrics),
         'summary_stats': summary_stats
     }
     
@@ -250,22 +440,26 @@ def market_overview(request):
     """
     Vue d'ensemble du marché avec les objets et leurs prix.
     """
-    market_engine = MarketEngine()
-    
-    # Récupération de tous les objets
-    items = Item.objects.all()
+    market_engine = get_engine()
+
+    # Récupération de tous les objets, puis instantanés de marché en
+    # requêtes groupées : le coût reste constant quel que soit le
+    # nombre d'objets, au lieu d'un get_market_snapshot (4 requêtes)
+    # par ligne
+    items = list(Item.objects.all())
+    snapshots = market_engine.get_market_snapshots(items)
     market_data = []
-    
+
     for item in items:
-        data = market_engine.get_market_snapshot(item)
-        
+        data = snapshots.get(item.id, {})
+
         # Ajout d'informations supplémentaires
         data.update({
-            'category': item.get_category_display(),
+            'category': CATEGORY_LABELS.get(item.category, item.category),
             'total_supply': item.total_supply,
             'description': item.description
         })
-        
+
         market_data.append(data)
     
     # Tri par volume décroissant
@@ -294,8 +488,11 @@ def download_results(request, simulation_id: str):
     Args:
         simulation_id: Identifiant de la simulation
     """
-    simulation = get_object_or_404(SimulationRun, simulation_id=simulation_id)
-    
+    simulation = get_object_or_404(
+        SimulationRun.objects.only('simulation_id', 'results_file_path'),
+        simulation_id=simulation_id
+    )
+
     if not simulation.results_file_path:
         raise Http404("Fichier de résultats non trouvé")
     
@@ -305,15 +502,16 @@ def download_results(request, simulation_id: str):
         raise Http404("Fichier de résultats non trouvé sur le disque")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        response = HttpResponse(content, content_type='application/json')
-        response['Content-Disposition'] = f'attachment; filename="simulation_{simulation_id}_results.json"'
-        
-        return response
-        
-    except Exception as e:
+        # Réponse en flux : le fichier est servi par morceaux via
+        # wsgi.file_wrapper au lieu d'être chargé entièrement en mémoire
+        return FileResponse(
+            file_path.open('rb'),
+            as_attachment=True,
+            filename=f"simulation_{simulation_id}_results.json",
+            content_type='application/json'
+        )
+
+    except OSError as e:
         logger.error(f"Erreur lors du téléchargement des résultats: {e}")
         messages.error(request, "Erreur lors du téléchargement du fichier")
         return redirect('ui:simulation_detail', simulation_id=simulation_id)
@@ -328,17 +526,27 @@ def simulation_status_api(request, simulation_id: str):
         simulation_id: Identifiant de la simulation
     """
     try:
-        simulation = get_object_or_404(SimulationRun, simulation_id=simulation_id)
-        
-        # Progression
-        completed_steps = SimulationMetric.objects.filter(simulation=simulation).count()
+        # Le compte d'étapes est annoté sur la requête du run : l'API,
+        # sollicitée en boucle par le front, passe de trois requêtes par
+        # appel à deux
+        simulation = get_object_or_404(
+            SimulationRun.objects.only(
+                'simulation_id', 'status', 'total_steps'
+            ).annotate(completed_steps=Count('metrics')),
+            simulation_id=simulation_id
+        )
+
+        completed_steps = simulation.completed_steps
         progress_percent = (completed_steps / simulation.total_steps * 100) if simulation.total_steps > 0 else 0
-        
-        # Dernière métrique
+
+        # Dernière métrique : dict limité aux trois colonnes affichées,
+        # sans instancier le modèle complet
         last_metric = SimulationMetric.objects.filter(
             simulation=simulation
-        ).order_by('-step_number').first()
-        
+        ).order_by('-step_number').values(
+            'step_number', 'transactions_executed', 'total_volume'
+        ).first()
+
         data = {
             'simulation_id': simulation.simulation_id,
             'status': simulation.status,
@@ -347,13 +555,31 @@ def simulation_status_api(request, simulation_id: str):
             'total_steps': simulation.total_steps,
             'is_running': simulation.status == 'running',
             'last_metric': {
-                'step': last_metric.step_number if last_metric else 0,
-                'transactions': last_metric.transactions_executed if last_metric else 0,
-                'volume': last_metric.total_volume if last_metric else 0
+                'step': last_metric['step_number'],
+                'transactions': last_metric['transactions_executed'],
+                'volume': last_metric['total_volume']
             } if last_metric else None
         }
-        
-        return JsonResponse(data)
+
+        # Une simulation en état terminal ne change plus : la réponse
+        # est cachable et porte un ETag fort, les sondages suivants se
+        # résolvent en 304 sans reconstruire le JSON. En cours de run,
+        # au contraire, aucune mise en cache.
+        if simulation.status in ('completed', 'failed', 'cancelled'):
+            etag = '"{}"'.format(hashlib.md5(
+                f"{simulation.simulation_id}:{simulation.status}:{completed_steps}".encode()
+            ).hexdigest())
+            conditional = get_conditional_response(request, etag=etag)
+            if conditional is not None:
+                return conditional
+            response = JsonResponse(data)
+            response['ETag'] = etag
+            response['Cache-Control'] = 'public, max-age=3600'
+        else:
+            response = JsonResponse(data)
+            response['Cache-Control'] = 'no-store'
+
+        return response
         
     except Exception as e:
         logger.error(f"Erreur API statut simulation: {e}")
@@ -368,7 +594,7 @@ def item_detail(request, item_id: int):
         item_id: ID de l'objet
     """
     item = get_object_or_404(Item, id=item_id)
-    market_engine = MarketEngine()
+    market_engine = get_engine()
     
     # Données de marché
     market_data = market_engine.get_market_snapshot(item)
@@ -376,19 +602,30 @@ def item_detail(request, item_id: int):
     # Carnet d'ordres
     order_book = market_engine.get_order_book(item)
     
-    # Historique des transactions (dernières 50)
+    # Historique des transactions (dernières 50) ; l'objet est joint
+    # dans la même requête pour que le rendu du tableau ne déclenche
+    # pas un chargement paresseux par ligne
     transactions = Transaction.objects.filter(
         item=item
-    ).order_by('-timestamp')[:50]
-    
-    # Données pour graphique des prix
-    price_history = []
-    for transaction in reversed(transactions):
-        price_history.append({
-            'timestamp': transaction.timestamp.isoformat(),
-            'price': float(transaction.price),
-            'quantity': transaction.quantity
-        })
+    ).select_related('item').order_by('-timestamp')[:50]
+
+    # Données pour graphique des prix : lignes values() limitées aux
+    # trois colonnes tracées (pas d'instances de modèle), remises en
+    # ordre chronologique en une inversion de liste
+    price_rows = list(
+        Transaction.objects.filter(item=item)
+        .order_by('-timestamp')
+        .values('timestamp', 'price', 'quantity')[:50]
+    )
+    price_rows.reverse()
+    price_history = [
+        {
+            'timestamp': row['timestamp'].isoformat(),
+            'price': float(row['price']),
+            'quantity': row['quantity']
+        }
+        for row in price_rows
+    ]
     
     context = {
         'item': item,